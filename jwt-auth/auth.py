@@ -7,7 +7,8 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from database import SessionLocal
 from models import Users
-from passlib.context import CryptContext
+from service_common.hashing import hash_password, verify_password
+from service_common.token_cache import decode_token, verify_token
 from dotenv import load_dotenv
 import os
 
@@ -23,7 +24,6 @@ ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
 
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="auth/token",
     scheme_name="Login with username & password"
@@ -60,7 +60,7 @@ db_dependency = Annotated[Session, Depends(get_db)]
 async def create_user(create_user_request: CreateUserRequest, db: db_dependency):
     create_user_model = Users(
         username=create_user_request.username,
-        hashed_password=bcrypt_context.hash(create_user_request.password)
+        hashed_password=await hash_password(create_user_request.password)
     )
     db.add(create_user_model)
     db.commit()
@@ -73,7 +73,7 @@ async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: db_dependency
 ):
-    user = authenticate_user(form_data.username, form_data.password, db)
+    user = await authenticate_user(form_data.username, form_data.password, db)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -103,11 +103,7 @@ async def login_for_access_token(
 @router.post("/refresh", response_model=Token)
 async def refresh_access_token(data: RefreshTokenRequest):
     try:
-        payload = jwt.decode(
-            data.refresh_token,
-            SECRET_KEY,
-            algorithms=[ALGORITHM]
-        )
+        payload = verify_token(data.refresh_token, SECRET_KEY, ALGORITHM)
 
         if payload.get("type") != "refresh":
             raise HTTPException(
@@ -141,9 +137,9 @@ async def refresh_access_token(data: RefreshTokenRequest):
 
 
 
-def authenticate_user(username: str, password: str, db: Session):
+async def authenticate_user(username: str, password: str, db: Session):
     user = db.query(Users).filter(Users.username == username).first()
-    if not user or not bcrypt_context.verify(password, user.hashed_password):
+    if not user or not await verify_password(password, user.hashed_password):
         return None
     return user
 
@@ -188,7 +184,7 @@ def get_current_user(
         )
 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token, SECRET_KEY, ALGORITHM)
         return {
             "username": payload.get("sub"),
             "id": payload.get("id")
@@ -4,10 +4,16 @@ from sqlalchemy.ext.declarative import declarative_base
 from dotenv import load_dotenv
 import os
 
+# Before the imports below: they read their settings from the environment at import time
 load_dotenv()
 
+from service_common.db_pool import engine_options, pool_monitor
+from service_common.query_log import instrument_engine
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+instrument_engine(engine)
+pool_monitor.register("primary", engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
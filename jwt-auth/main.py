@@ -1,29 +1,25 @@
-from fastapi import FastAPI, status, Depends, HTTPException
-import models
-from database import engine, SessionLocal
+from contextlib import asynccontextmanager
+from functools import partial
+from fastapi import APIRouter, FastAPI, status, Depends, HTTPException
+from database import SessionLocal
 from sqlalchemy.orm import Session
 from typing import Annotated
+from service_common.admin import router as admin_router
 from auth import router as auth_router
 from auth import get_current_user
+from migrate import bootstrap_schema
 from fastapi.middleware.cors import CORSMiddleware
+from service_common.db_pool import POOL_METRIC_FIELDS, pool_monitor, pool_stats
+from service_common.hashing import hashing_executor
+from service_common.metrics import install_metrics, instrument_sqlalchemy, observe_section, register_stats
+from service_common.query_log import QueryLogMiddleware
+from service_common.token_cache import token_cache
 
 origins = [
     "http://localhost:3000",
 ]
 
-app = FastAPI()
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(auth_router)
-
-models.Base.metadata.create_all(bind=engine)
+router = APIRouter()
 
 def get_db():
     db = SessionLocal()
@@ -36,8 +32,44 @@ def get_db():
 db_dependency = Annotated[Session, Depends(get_db)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
 
-@app.get("/", status_code=status.HTTP_200_OK)
+@router.get("/", status_code=status.HTTP_200_OK)
 async def user(user: user_dependency, db: db_dependency):
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    return {"User": user}
\ No newline at end of file
+    return {"User": user}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create tables when the server starts, and only when the declared schema changed
+    bootstrap_schema()
+    yield
+    hashing_executor.shutdown()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(lifespan=lifespan)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(QueryLogMiddleware)
+    install_metrics(app)
+    instrument_sqlalchemy()
+    hashing_executor.observe = partial(observe_section, "bcrypt")
+    token_cache.observe = partial(observe_section, "jwt")
+    pool_monitor.observe = partial(observe_section, "db_pool_wait")
+    register_stats("db_pool", "pool", pool_stats, POOL_METRIC_FIELDS)
+    app.state.pool_stats = pool_stats
+
+    app.include_router(auth_router)
+    app.include_router(admin_router)
+    app.include_router(router)
+    return app
+
+
+app = create_app()
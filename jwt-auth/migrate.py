@@ -0,0 +1,50 @@
+"""
+Checksum-gated schema setup for the jwt-auth tables (see schema_version.py).
+
+Run ahead of a deploy with ``python migrate.py`` (``--check`` only compares
+checksums and exits 1 when the schema is stale).
+"""
+import argparse
+import logging
+import sys
+
+import models
+from database import engine
+from service_common.schema_version import ensure_schema, metadata_checksum, migrate, stored_checksum
+
+SCHEMA_COMPONENT = "jwt-auth"
+# Bump whenever a hand-written upgrade step is added
+SCHEMA_REVISION = 0
+
+
+def schema_checksum() -> str:
+    return metadata_checksum(models.Base.metadata, engine.dialect, SCHEMA_REVISION)
+
+
+def apply(conn):
+    models.Base.metadata.create_all(bind=conn)
+
+
+def bootstrap_schema() -> bool:
+    return ensure_schema(engine, SCHEMA_COMPONENT, schema_checksum(), apply)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="only compare checksums; exit 1 if the schema is stale")
+    parser.add_argument("--force", action="store_true", help="run the DDL even if the checksum matches")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    declared = schema_checksum()
+    if args.check:
+        stored = stored_checksum(engine, SCHEMA_COMPONENT)
+        print(f"jwt-auth: stored {stored or '-'} declared {declared}")
+        return 0 if stored == declared else 1
+    migrated = migrate(engine, SCHEMA_COMPONENT, declared, apply, force=args.force)
+    print(f"jwt-auth: {'migrated to' if migrated else 'already at'} {declared}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,11 @@
 import os
 from pathlib import Path
-from fastapi import FastAPI, Depends
+from fastapi import APIRouter, FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
 from dotenv import load_dotenv
 
+from service_common.metrics import install_metrics
 from middleware import get_current_user
 from auth import router as auth_router
 
@@ -15,29 +16,13 @@ load_dotenv(env_path)
 # Security scheme for Swagger UI
 security_scheme = HTTPBearer()
 
-app = FastAPI(
-    title="Okta Auth API - Resource Server",
-    swagger_ui_init_oauth={
-        "clientId": os.getenv("OKTA_CLIENT_ID"),
-        "usePkceWithAuthorizationCodeGrant": True,
-    }
-)
-
 # CORS configuration for frontend on port 8000
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:8000")
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[FRONTEND_URL],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-# Include auth router
-app.include_router(auth_router)
+router = APIRouter()
 
 
-@app.get("/")
+@router.get("/")
 def read_root():
     """Root endpoint"""
     return {
@@ -46,13 +31,13 @@ def read_root():
     }
 
 
-@app.get("/api/health")
+@router.get("/api/health")
 def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
 
 
-@app.get("/api/protected", dependencies=[Depends(security_scheme)])
+@router.get("/api/protected", dependencies=[Depends(security_scheme)])
 async def protected_route(user: dict = Depends(get_current_user)):
     """
     Protected route - requires valid Okta access token.
@@ -71,7 +56,34 @@ async def protected_route(user: dict = Depends(get_current_user)):
     }
 
 
-@app.get("/api/test", dependencies=[Depends(security_scheme)])
+@router.get("/api/test", dependencies=[Depends(security_scheme)])
 def test_route(user: dict = Depends(get_current_user)):
     """Test route - requires valid Okta access token."""
-    return {"message": "Hello World"}
\ No newline at end of file
+    return {"message": "Hello World"}
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(
+        title="Okta Auth API - Resource Server",
+        swagger_ui_init_oauth={
+            "clientId": os.getenv("OKTA_CLIENT_ID"),
+            "usePkceWithAuthorizationCodeGrant": True,
+        }
+    )
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[FRONTEND_URL],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    install_metrics(app)
+
+    # Include auth router
+    app.include_router(auth_router)
+    app.include_router(router)
+    return app
+
+
+app = create_app()
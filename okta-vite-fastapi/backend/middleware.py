@@ -8,6 +8,7 @@ import httpx
 import json
 import yaml
 from dotenv import load_dotenv
+from service_common.metrics import timed
 
 # Load environment variables from parent directory
 env_path = Path(__file__).parent.parent / ".env"
@@ -98,13 +99,14 @@ async def verify_access_token(token: str) -> Dict[str, Any]:
             raise HTTPException(status_code=401, detail="Unable to find matching key")
         
         # Verify and decode token
-        claims = jwt.decode(
-            token,
-            key,
-            algorithms=["RS256"],
-            audience=OKTA_AUDIENCE,
-            issuer=OKTA_ISSUER,
-        )
+        with timed("jwt"):
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=OKTA_AUDIENCE,
+                issuer=OKTA_ISSUER,
+            )
         
         return claims
         
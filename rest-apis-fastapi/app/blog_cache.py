@@ -0,0 +1,103 @@
+"""
+Read-through cache for single blog lookups.
+
+A handful of posts usually get most of the ``GET /blogs/{blog_id}`` traffic,
+so the encoded ``BlogResponse`` JSON of recently read blogs is kept in memory
+for BLOG_CACHE_TTL seconds (bounded to BLOG_CACHE_SIZE entries, least
+recently used first out). Writes made by this process invalidate the affected
+ids. Each body also records the content version (see http_cache.py) it was
+loaded under, and a lookup for a newer version misses: a write from another
+worker is picked up once this worker's version cache refreshes, and a body is
+never served under an ETag newer than itself.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+BLOG_CACHE_SIZE = int(os.getenv("BLOG_CACHE_SIZE", "1000"))
+BLOG_CACHE_TTL = float(os.getenv("BLOG_CACHE_TTL", "30"))
+
+# Variant holding the BlogWithOwner body (?include_owner=true)
+OWNER_VARIANT = "owner"
+
+
+class BlogCache:
+    """
+    Bounded TTL+LRU of encoded blog bodies keyed by blog id. Each id can hold
+    several variants of its body (e.g. with the owner embedded); invalidating
+    the id drops all of them.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # blog id -> {variant: (body, version, expires_at)}; the LRU order is per blog id
+        self._entries: "OrderedDict[int, dict[str, tuple[bytes, int, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a load that raced a write is not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, blog_id: int, variant: str = "", version: int = 0) -> Optional[bytes]:
+        """The cached body, unless it expired or was loaded before content ``version``."""
+        with self._lock:
+            entry = self._entries.get(blog_id, {}).get(variant)
+            if entry is not None and entry[1] >= version and entry[2] > time.monotonic():
+                self._entries.move_to_end(blog_id)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[blog_id][variant]
+            self.misses += 1
+            return None
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def put(self, blog_id: int, body: bytes, generation: int, variant: str = "", version: int = 0):
+        """
+        Store ``body``, loaded under content ``version``, unless an
+        invalidation happened since ``generation`` was read.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries.setdefault(blog_id, {})[variant] = (body, version, time.monotonic() + self.ttl)
+            self._entries.move_to_end(blog_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *blog_ids: int):
+        with self._lock:
+            self._generation += 1
+            for blog_id in blog_ids:
+                self._entries.pop(blog_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Shared by every blog router so writes through one are seen by the others
+blog_cache = BlogCache(BLOG_CACHE_SIZE, BLOG_CACHE_TTL)
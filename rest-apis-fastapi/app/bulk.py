@@ -0,0 +1,29 @@
+"""
+Per-item results for the bulk blog endpoints.
+"""
+from typing import List
+
+
+def bulk_status(ids: List[int], affected: set, existing: set, ok_status: str) -> List[dict]:
+    """Per-id result: ok_status when affected, otherwise forbidden or not_found."""
+    results = []
+    for blog_id in ids:
+        if blog_id in affected:
+            status = ok_status
+        elif blog_id in existing:
+            status = "forbidden"
+        else:
+            status = "not_found"
+        results.append({"id": blog_id, "status": status})
+    return results
+
+
+def claim_inserted(pending: List[tuple], inserted: dict, results: List[dict]) -> List[tuple]:
+    """Record the rows of ``pending`` whose slug was inserted; return the rest."""
+    remaining = []
+    for index, row in pending:
+        if row["slug"] in inserted:
+            results[index] = {"id": inserted[row["slug"]], "slug": row["slug"], "status": "created"}
+        else:
+            remaining.append((index, row))
+    return remaining
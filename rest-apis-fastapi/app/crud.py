@@ -0,0 +1,275 @@
+"""
+SQLAlchemy statements shared by the sync (routers/blog.py) and async
+(routers/blog_async.py) blog routers.
+"""
+from typing import Iterable, List, Optional
+
+from sqlalchemy import column, delete, func, literal_column, select, table, tuple_, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import joinedload
+
+from app.blog_cache import blog_cache
+from app.bulk import bulk_status, claim_inserted
+from app.database import note_primary_write
+from app.http_cache import BLOGS_SCOPE, HTTP_CACHE_VERSION_TTL, Version, VersionCache
+from app.models import BLOG_SUMMARY_COLUMNS, Blog, ContentVersion, Users
+from app.slugs import MAX_SLUG_ATTEMPTS, SlugAllocationError, batch_slugs, next_slug, retry_slugs, slugify, suffix_pattern, suffix_start
+from app.timeutils import utcnow
+
+# Cached content versions for the conditional GETs served by the SQLAlchemy routers
+blog_versions = VersionCache(HTTP_CACHE_VERSION_TTL)
+
+
+def dialect_insert(dialect_name: str):
+    """The INSERT construct with ON CONFLICT support for the given dialect."""
+    return sqlite.insert if dialect_name == "sqlite" else postgresql.insert
+
+
+def insert_blogs_statement(dialect_name: str, rows: List[dict]):
+    """Multi-row INSERT ... ON CONFLICT (slug) DO NOTHING."""
+    return dialect_insert(dialect_name)(Blog).values(rows).on_conflict_do_nothing(index_elements=[Blog.slug])
+
+
+def insert_blog_statement(dialect_name: str, values: dict):
+    """INSERT ... ON CONFLICT (slug) DO NOTHING RETURNING the new Blog."""
+    return insert_blogs_statement(dialect_name, [values]).returning(Blog)
+
+
+def taken_slugs_statement(base: str):
+    """The slug with the highest numeric suffix of ``base``, if any."""
+    suffix = func.substr(Blog.slug, suffix_start(base))
+    return (
+        select(Blog.slug)
+        .where(Blog.slug.like(suffix_pattern(base)))
+        # Digits only: "my-post-7" counts, "my-post-about-cats" does not
+        .where(func.ltrim(suffix, "0123456789") == "")
+        .order_by(func.length(Blog.slug).desc(), Blog.slug.desc())
+        .limit(1)
+    )
+
+
+def batch_taken_slugs_statement(bases: Iterable[str]):
+    """taken_slugs_statement() for each of ``bases``, in one query."""
+    # One SELECT per base; BULK_MAX_ITEMS stays within SQLite's 500-term compound limit
+    return union_all(*(select(taken_slugs_statement(base).subquery().c.slug) for base in sorted(set(bases))))
+
+
+def allocate_and_insert(db, values: dict) -> Blog:
+    """Insert a blog with a unique slug derived from ``values["title"]``."""
+    base = slugify(values["title"])
+    slug = base
+    for _ in range(MAX_SLUG_ATTEMPTS):
+        stmt = insert_blog_statement(db.get_bind().dialect.name, {**values, "slug": slug})
+        blog = db.scalars(stmt).first()
+        if blog is not None:
+            return blog
+        slug = next_slug(base, db.scalars(taken_slugs_statement(base)))
+    raise SlugAllocationError(f"Could not allocate a slug for {base!r}")
+
+
+async def allocate_and_insert_async(db, values: dict) -> Blog:
+    """AsyncSession variant of allocate_and_insert()."""
+    base = slugify(values["title"])
+    slug = base
+    for _ in range(MAX_SLUG_ATTEMPTS):
+        stmt = insert_blog_statement(db.get_bind().dialect.name, {**values, "slug": slug})
+        blog = (await db.scalars(stmt)).first()
+        if blog is not None:
+            return blog
+        slug = next_slug(base, await db.scalars(taken_slugs_statement(base)))
+    raise SlugAllocationError(f"Could not allocate a slug for {base!r}")
+
+
+def fts5_query(query: str) -> str:
+    """Quote every term so user input is matched literally, never parsed as FTS5 syntax."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+def embed_owner(stmt, summary: bool):
+    """
+    Load each blog's author in the same query as the blogs (select or Query):
+    a LEFT JOIN column for the summary projection, joinedload(Blog.owner) for
+    full rows. Either way the rows expose ``owner_username``.
+    """
+    if summary:
+        return stmt.outerjoin(Blog.owner).add_columns(Users.username.label("owner_username"))
+    return stmt.options(joinedload(Blog.owner))
+
+
+def owned_blogs_statement(owner_id: int, summary: bool, published: Optional[bool], after: Optional[tuple], limit: int):
+    """
+    One author's posts, drafts included, newest first: a range scan on
+    idx_blogs_owner_created_at_id. ``after`` is a decoded page cursor.
+    """
+    stmt = select(*BLOG_SUMMARY_COLUMNS) if summary else select(Blog)
+    stmt = stmt.where(Blog.owner_id == owner_id)
+    if published is not None:
+        stmt = stmt.where(Blog.published == published)
+    if after:
+        stmt = stmt.where(tuple_(Blog.created_at, Blog.id) < tuple_(*after))
+    return stmt.order_by(Blog.created_at.desc(), Blog.id.desc()).limit(limit)
+
+
+def search_blogs_statement(dialect_name: str, query: str, limit: int, offset: int):
+    """Ranked full-text search over published blogs, best matches first."""
+    if dialect_name == "sqlite":
+        fts = table("blogs_fts", column("rowid"))
+        # bm25() is lower-is-better; title matches weigh 10x content matches
+        rank = (-func.bm25(literal_column("blogs_fts"), 10.0, 1.0)).label("rank")
+        stmt = (
+            select(*BLOG_SUMMARY_COLUMNS, rank)
+            .join_from(fts, Blog, Blog.id == fts.c.rowid)
+            .where(literal_column("blogs_fts").op("MATCH")(fts5_query(query)))
+        )
+    else:
+        tsquery = func.websearch_to_tsquery("english", query)
+        search_vector = literal_column("blogs.search_vector")
+        rank = func.ts_rank_cd(search_vector, tsquery).label("rank")
+        stmt = select(*BLOG_SUMMARY_COLUMNS, rank).where(search_vector.op("@@")(tsquery))
+    return (
+        stmt.where(Blog.published == True)
+        .order_by(rank.desc(), Blog.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+
+
+def delete_owned_statement(ids: List[int], owner_id: int):
+    return (
+        delete(Blog)
+        .where(Blog.id.in_(ids), Blog.owner_id == owner_id)
+        .returning(Blog.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def publish_owned_statement(ids: List[int], owner_id: int, published: bool):
+    return (
+        update(Blog)
+        .where(Blog.id.in_(ids), Blog.owner_id == owner_id)
+        .values(published=published)
+        .returning(Blog.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def existing_ids_statement(ids: List[int]):
+    return select(Blog.id).where(Blog.id.in_(ids))
+
+
+def bulk_insert_blogs(db, rows: List[dict]) -> List[dict]:
+    """
+    Insert many blogs with one multi-row INSERT. Rows whose slug was already
+    taken get the next free suffixes from one batch_taken_slugs_statement()
+    lookup and are retried together, up to MAX_SLUG_ATTEMPTS inserts in all.
+    """
+    slugs = batch_slugs(row["title"] for row in rows)
+    pending = [(index, {**row, "slug": slug}) for index, (row, slug) in enumerate(zip(rows, slugs))]
+    results = [{"status": "conflict"}] * len(rows)
+    for attempt in range(MAX_SLUG_ATTEMPTS):
+        if attempt:
+            bases = (slugify(row["title"]) for _, row in pending)
+            pending = retry_slugs(pending, db.scalars(batch_taken_slugs_statement(bases)))
+        stmt = insert_blogs_statement(db.get_bind().dialect.name, [row for _, row in pending])
+        inserted = {slug: blog_id for blog_id, slug in db.execute(stmt.returning(Blog.id, Blog.slug))}
+        pending = claim_inserted(pending, inserted, results)
+        if not pending:
+            break
+    return results
+
+
+def bulk_delete_blogs(db, ids: List[int], owner_id: int) -> List[dict]:
+    ids = list(dict.fromkeys(ids))
+    affected = set(db.scalars(delete_owned_statement(ids, owner_id)))
+    missing = [blog_id for blog_id in ids if blog_id not in affected]
+    existing = set(db.scalars(existing_ids_statement(missing))) if missing else set()
+    return bulk_status(ids, affected, existing, "deleted")
+
+
+def bulk_publish_blogs(db, ids: List[int], owner_id: int, published: bool) -> List[dict]:
+    ids = list(dict.fromkeys(ids))
+    affected = set(db.scalars(publish_owned_statement(ids, owner_id, published)))
+    missing = [blog_id for blog_id in ids if blog_id not in affected]
+    existing = set(db.scalars(existing_ids_statement(missing))) if missing else set()
+    return bulk_status(ids, affected, existing, "updated")
+
+
+async def bulk_insert_blogs_async(db, rows: List[dict]) -> List[dict]:
+    """AsyncSession variant of bulk_insert_blogs()."""
+    slugs = batch_slugs(row["title"] for row in rows)
+    pending = [(index, {**row, "slug": slug}) for index, (row, slug) in enumerate(zip(rows, slugs))]
+    results = [{"status": "conflict"}] * len(rows)
+    for attempt in range(MAX_SLUG_ATTEMPTS):
+        if attempt:
+            bases = (slugify(row["title"]) for _, row in pending)
+            pending = retry_slugs(pending, await db.scalars(batch_taken_slugs_statement(bases)))
+        stmt = insert_blogs_statement(db.get_bind().dialect.name, [row for _, row in pending])
+        inserted = {slug: blog_id for blog_id, slug in await db.execute(stmt.returning(Blog.id, Blog.slug))}
+        pending = claim_inserted(pending, inserted, results)
+        if not pending:
+            break
+    return results
+
+
+async def bulk_delete_blogs_async(db, ids: List[int], owner_id: int) -> List[dict]:
+    ids = list(dict.fromkeys(ids))
+    affected = set(await db.scalars(delete_owned_statement(ids, owner_id)))
+    missing = [blog_id for blog_id in ids if blog_id not in affected]
+    existing = set(await db.scalars(existing_ids_statement(missing))) if missing else set()
+    return bulk_status(ids, affected, existing, "deleted")
+
+
+async def bulk_publish_blogs_async(db, ids: List[int], owner_id: int, published: bool) -> List[dict]:
+    ids = list(dict.fromkeys(ids))
+    affected = set(await db.scalars(publish_owned_statement(ids, owner_id, published)))
+    missing = [blog_id for blog_id in ids if blog_id not in affected]
+    existing = set(await db.scalars(existing_ids_statement(missing))) if missing else set()
+    return bulk_status(ids, affected, existing, "updated")
+
+
+def version_statement(scope: str):
+    return select(ContentVersion.version, ContentVersion.updated_at).where(ContentVersion.scope == scope)
+
+
+def bump_version_statement(dialect_name: str, scope: str):
+    now = utcnow()
+    return (
+        dialect_insert(dialect_name)(ContentVersion)
+        .values(scope=scope, version=1, updated_at=now)
+        .on_conflict_do_update(
+            index_elements=[ContentVersion.scope],
+            set_={"version": ContentVersion.version + 1, "updated_at": now},
+        )
+    )
+
+
+def load_version(db, scope: str = BLOGS_SCOPE) -> Version:
+    row = db.execute(version_statement(scope)).first()
+    return (row.version, row.updated_at) if row else (0, None)
+
+
+def commit_blog_write(db, blog_ids: Iterable[int] = ()):
+    """
+    Bump the blogs version in the write's transaction, commit, and drop the
+    cached version and the cached copies of ``blog_ids``. Created ids are
+    passed too, since SQLite may hand out the id of a deleted row again.
+    """
+    db.execute(bump_version_statement(db.get_bind().dialect.name, BLOGS_SCOPE))
+    db.commit()
+    note_primary_write()
+    blog_versions.invalidate(BLOGS_SCOPE)
+    blog_cache.invalidate(*blog_ids)
+
+
+async def load_version_async(db, scope: str = BLOGS_SCOPE) -> Version:
+    row = (await db.execute(version_statement(scope))).first()
+    return (row.version, row.updated_at) if row else (0, None)
+
+
+async def commit_blog_write_async(db, blog_ids: Iterable[int] = ()):
+    """AsyncSession variant of commit_blog_write()."""
+    await db.execute(bump_version_statement(db.get_bind().dialect.name, BLOGS_SCOPE))
+    await db.commit()
+    note_primary_write()
+    blog_versions.invalidate(BLOGS_SCOPE)
+    blog_cache.invalidate(*blog_ids)
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from dotenv import load_dotenv
@@ -6,8 +7,188 @@ import os
 
 load_dotenv()
 
+from service_common.db_pool import engine_options, pool_monitor
+from service_common.query_log import instrument_engine
+from .replicas import DATABASE_REPLICA_URLS, DB_REPLICA_RETRY_AFTER, DB_REPLICA_STICKY_SECONDS, ReplicaRouter
+from . import sqlite_tuning
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# Serve the blog and auth routers from an AsyncSession instead of the sync Session
+USE_ASYNC_DB = os.getenv("USE_ASYNC_DB", "false").lower() in ("1", "true", "yes")
+
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme.split("+")[0], scheme) + sep + rest
+
+
+def sqlite_connect_args(url: str) -> dict:
+    return {"check_same_thread": False} if url.startswith("sqlite") else {}
+
+
+def sqlite_pool_options(url: str, writer: bool) -> dict:
+    """Reader pool sizing of the SQLite performance profile (sqlite_tuning.py), if it applies."""
+    if writer or not sqlite_tuning.enabled_for(url):
+        # Writers keep the usual pool and queue on BEGIN IMMEDIATE instead
+        return {}
+    return sqlite_tuning.reader_pool_options()
+
+
+# Opt-in WAL / single-writer profile for file-backed SQLite
+SQLITE_TUNED = sqlite_tuning.enabled_for(DATABASE_URL)
+
+engine = create_engine(
+    DATABASE_URL,
+    connect_args=sqlite_connect_args(DATABASE_URL),
+    **engine_options(DATABASE_URL, **sqlite_pool_options(DATABASE_URL, writer=True)),
+)
+if SQLITE_TUNED:
+    sqlite_tuning.apply_profile(engine, writer=True)
+instrument_engine(engine)
+pool_monitor.register("primary", engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+# Read-only routes borrow their connection from these (see replicas.py)
+REPLICA_ERRORS = (DBAPIError, PoolTimeoutError)
+replica_engines = [
+    create_engine(url, connect_args=sqlite_connect_args(url), **engine_options(url, pool_pre_ping=True))
+    for url in DATABASE_REPLICA_URLS
+]
+# Tuned SQLite without replicas reads through a query_only pool on the same
+# file; WAL readers see every commit, so reads never need to stick to the writer
+LOCAL_SQLITE_READER = SQLITE_TUNED and not DATABASE_REPLICA_URLS
+if LOCAL_SQLITE_READER:
+    reader_engine = create_engine(
+        DATABASE_URL,
+        connect_args=sqlite_connect_args(DATABASE_URL),
+        **engine_options(DATABASE_URL, **sqlite_pool_options(DATABASE_URL, writer=False)),
+    )
+    sqlite_tuning.apply_profile(reader_engine, writer=False)
+    replica_engines.append(reader_engine)
+READ_STICKY_SECONDS = 0 if LOCAL_SQLITE_READER else DB_REPLICA_STICKY_SECONDS
+
+for index, replica_engine in enumerate(replica_engines):
+    instrument_engine(replica_engine)
+    pool_monitor.register("sqlite-reader" if LOCAL_SQLITE_READER else f"replica-{index}", replica_engine)
+read_router = ReplicaRouter(replica_engines, DB_REPLICA_RETRY_AFTER, READ_STICKY_SECONDS, REPLICA_ERRORS)
+
+async_engine = None
+AsyncSessionLocal = None
+async_read_router = None
+
+if USE_ASYNC_DB:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        connect_args=sqlite_connect_args(ASYNC_DATABASE_URL),
+        **engine_options(ASYNC_DATABASE_URL, is_async=True, **sqlite_pool_options(ASYNC_DATABASE_URL, writer=True)),
+    )
+    if sqlite_tuning.enabled_for(ASYNC_DATABASE_URL):
+        sqlite_tuning.apply_profile(async_engine, writer=True)
+    instrument_engine(async_engine)
+    pool_monitor.register("async-primary", async_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    async_replica_engines = [
+        create_async_engine(
+            to_async_url(url),
+            connect_args=sqlite_connect_args(url),
+            **engine_options(to_async_url(url), is_async=True, pool_pre_ping=True),
+        )
+        for url in DATABASE_REPLICA_URLS
+    ]
+    if LOCAL_SQLITE_READER and sqlite_tuning.enabled_for(ASYNC_DATABASE_URL):
+        async_reader_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            connect_args=sqlite_connect_args(ASYNC_DATABASE_URL),
+            **engine_options(ASYNC_DATABASE_URL, is_async=True, **sqlite_pool_options(ASYNC_DATABASE_URL, writer=False)),
+        )
+        sqlite_tuning.apply_profile(async_reader_engine, writer=False)
+        async_replica_engines.append(async_reader_engine)
+    for index, replica_engine in enumerate(async_replica_engines):
+        instrument_engine(replica_engine)
+        pool_monitor.register("async-sqlite-reader" if LOCAL_SQLITE_READER else f"async-replica-{index}", replica_engine)
+    async_read_router = ReplicaRouter(
+        async_replica_engines,
+        DB_REPLICA_RETRY_AFTER,
+        READ_STICKY_SECONDS,
+        REPLICA_ERRORS,
+    )
+
+
+def get_read_db():
+    """
+    Session for read-only routes: bound to a healthy replica when
+    DATABASE_REPLICA_URLS is set, otherwise an ordinary primary session.
+    """
+    if not replica_engines:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+        return
+
+    conn = read_router.connect(lambda replica: replica.connect(), engine.connect)
+    db = SessionLocal(bind=conn, info={"replica": bool(DATABASE_REPLICA_URLS) and conn.engine is not engine})
+    try:
+        yield db
+    finally:
+        db.close()
+        conn.close()
+
+
+def reads_may_lag(db) -> bool:
+    """
+    True when ``db`` (a Session or AsyncSession from the read dependencies) is
+    bound to a streaming replica that may trail the primary. Reads made there
+    must not feed the process-wide caches, whose entries writes invalidate.
+    """
+    return db.info.get("replica", False)
+
+
+def note_primary_write():
+    """Record a committed write so reads stay on the primary until replicas catch up."""
+    read_router.note_write()
+    if async_read_router is not None:
+        async_read_router.note_write()
+
+
+def replica_stats() -> dict:
+    return (async_read_router or read_router).stats()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """AsyncSession variant of get_read_db()."""
+    if not async_read_router.replicas:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    conn = await async_read_router.connect_async(lambda replica: replica.connect(), async_engine.connect)
+    replica = bool(DATABASE_REPLICA_URLS) and conn.engine is not async_engine
+    try:
+        async with AsyncSessionLocal(bind=conn, info={"replica": replica}) as db:
+            yield db
+    finally:
+        await conn.close()
@@ -0,0 +1,44 @@
+"""
+Single-pass JSON responses for the blog read endpoints.
+
+Returning ORM objects or dict rows makes FastAPI validate them against
+``response_model`` and only then serialize the result. The helpers here build
+the pydantic models straight from the rows (``from_attributes``) and dump them
+to JSON bytes in the same call; the bytes go out through
+``PreEncodedJSONResponse`` untouched, so nothing is validated or encoded twice.
+``response_model`` stays on the routes for the OpenAPI schema.
+"""
+from functools import lru_cache
+from typing import List, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+class PreEncodedJSONResponse(Response):
+    """JSON response whose body is already encoded."""
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def encode_one(model: Type[BaseModel], row) -> bytes:
+    """JSON for one ORM object, Row or dict row, validated as ``model``."""
+    return model.model_validate(row, from_attributes=True).model_dump_json().encode()
+
+
+def encode_rows(model: Type[BaseModel], rows) -> bytes:
+    """JSON array for ORM objects, Rows or dict rows, validated as ``model``."""
+    adapter = _list_adapter(model)
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def json_response(body: bytes, response: Response, status_code: int = 200) -> PreEncodedJSONResponse:
+    """
+    Wrap pre-encoded ``body``, carrying over the headers that dependencies and
+    the route set on the injected ``response`` (ETag, X-Next-Cursor, ...).
+    """
+    return PreEncodedJSONResponse(body, status_code=status_code, headers=dict(response.headers))
@@ -0,0 +1,111 @@
+"""
+Conditional GET support (ETag / Last-Modified) for blog reads.
+
+Every write to blogs bumps a row in the ``content_versions`` table inside the
+same transaction. Read endpoints derive a strong ETag from that version, so a
+client revalidating with ``If-None-Match`` gets a bodiless 304 before any blog
+row is loaded or serialized. Versions are cached in-process for
+HTTP_CACHE_VERSION_TTL seconds, which keeps the check to a dictionary lookup
+on hot paths; writes made by this process invalidate the cache immediately,
+writes from other workers become visible within the TTL.
+"""
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response, status
+
+# Version scope covering every blog (listings and single reads)
+BLOGS_SCOPE = "blogs"
+
+HTTP_CACHE_VERSION_TTL = float(os.getenv("HTTP_CACHE_VERSION_TTL", "1"))
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+
+CACHE_CONTROL = f"public, max-age={HTTP_CACHE_MAX_AGE}, must-revalidate"
+# Per-user listings (drafts included) must never be stored by shared caches
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+Version = Tuple[int, Optional[datetime]]
+
+
+class VersionCache:
+    """Short-lived, process-local cache of (version, updated_at) per scope."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, scope: str) -> Optional[Version]:
+        with self._lock:
+            entry = self._entries.get(scope)
+        if entry is None or entry[1] < time.monotonic():
+            return None
+        return entry[0]
+
+    def set(self, scope: str, version: Version):
+        with self._lock:
+            self._entries[scope] = (version, time.monotonic() + self.ttl)
+
+    def invalidate(self, scope: str):
+        with self._lock:
+            self._entries.pop(scope, None)
+
+    def get_or_load(self, scope: str, load: Callable[[], Version]) -> Version:
+        version = self.get(scope)
+        if version is None:
+            version = load()
+            self.set(scope, version)
+        return version
+
+
+def make_etag(version: int, *parts) -> str:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison function (RFC 9110 13.1.2).
+    # "*" is not honoured: the check runs before the route knows the blog
+    # exists, and a 304 must not stand in for a 404.
+    tags = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def check_conditional(request: Request, response: Response, version: Version, *parts):
+    """
+    Set ETag, Last-Modified and Cache-Control on ``response``, or raise a
+    bodiless 304 when the client's copy is still current.
+    """
+    number, last_modified = version
+    etag = make_etag(number, request.url.path, request.url.query, *parts)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    elif if_modified_since is not None and last_modified is not None:
+        not_modified = _not_modified_since(if_modified_since, last_modified)
+    else:
+        not_modified = False
+
+    if not_modified:
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
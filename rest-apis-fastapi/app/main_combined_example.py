@@ -2,8 +2,10 @@
 Example of how to integrate psycopg routes into the existing main.py
 This shows both SQLAlchemy and psycopg routes running side-by-side
 """
-from fastapi import FastAPI, status, Depends, HTTPException
-from . import models
+from contextlib import asynccontextmanager
+from functools import partial
+from fastapi import APIRouter, FastAPI, status, Depends, HTTPException
+from . import migrations
 from .database import engine, SessionLocal
 from sqlalchemy.orm import Session
 from typing import Annotated
@@ -15,45 +17,23 @@ from .routers import auth_psycopg
 from .routers import blog_psycopg
 
 from .utils import get_current_user
-from .database_psycopg import init_db, close_pool
+from .database_psycopg import POOL_METRIC_FIELDS as PSYCOPG_POOL_METRIC_FIELDS, all_pool_stats, init_db, close_pool
 
 from fastapi.middleware.cors import CORSMiddleware
-
-app = FastAPI()
+from service_common.db_pool import POOL_METRIC_FIELDS, pool_monitor, pool_stats
+from service_common.hashing import hashing_executor
+from service_common.metrics import install_metrics, instrument_sqlalchemy, observe_section, register_stats
+from service_common.query_log import QueryLogMiddleware
+from service_common.token_cache import token_cache
+from service_common import admin as admin_router
+from .blog_cache import blog_cache
+from .pagination import NEXT_CURSOR_HEADER
 
 origins = [
     "http://localhost:3000",
 ]
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include SQLAlchemy routers (existing)
-app.include_router(auth_router.router)
-app.include_router(blog_router.router)
-
-# Include psycopg routers (new - for comparison)
-app.include_router(auth_psycopg.router)
-app.include_router(blog_psycopg.router)
-
-# SQLAlchemy table creation (existing)
-models.Base.metadata.create_all(bind=engine)
-
-# psycopg table initialization (new)
-@app.on_event("startup")
-async def startup_event():
-    """Initialize psycopg database tables on startup"""
-    init_db()
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Close psycopg connection pool on shutdown"""
-    close_pool()
+router = APIRouter()
 
 def get_db():
     db = SessionLocal()
@@ -65,18 +45,18 @@ def get_db():
 db_dependency = Annotated[Session, Depends(get_db)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
 
-@app.get("/health", status_code=status.HTTP_200_OK)
+@router.get("/health", status_code=status.HTTP_200_OK)
 async def health_check():
-    return {"status": "ok", "service": "fastapi-backend"}
+    return {"status": "ok", "service": "fastapi-backend", "blog_cache": blog_cache.stats()}
 
-@app.get("/", status_code=status.HTTP_200_OK)
+@router.get("/", status_code=status.HTTP_200_OK)
 async def user(user: user_dependency, db: db_dependency):
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     return {"User": user}
 
 # Example endpoint showing the difference
-@app.get("/api-info", status_code=status.HTTP_200_OK)
+@router.get("/api-info", status_code=status.HTTP_200_OK)
 async def api_info():
     return {
         "message": "This API supports both SQLAlchemy and psycopg implementations",
@@ -93,3 +73,52 @@ async def api_info():
             }
         }
     }
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # SQLAlchemy tables, migrated only when their checksum changed
+    migrations.bootstrap(engine)
+    # psycopg tables, same checksum gate
+    init_db()
+    yield
+    # Close psycopg connection pool on shutdown
+    close_pool()
+    hashing_executor.shutdown()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(lifespan=lifespan)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
+    )
+    app.add_middleware(QueryLogMiddleware)
+    install_metrics(app)
+    instrument_sqlalchemy()
+    hashing_executor.observe = partial(observe_section, "bcrypt")
+    token_cache.observe = partial(observe_section, "jwt")
+    pool_monitor.observe = partial(observe_section, "db_pool_wait")
+    register_stats("db_pool", "pool", pool_stats, POOL_METRIC_FIELDS)
+    register_stats("psycopg_pool", "pool", all_pool_stats, PSYCOPG_POOL_METRIC_FIELDS)
+    app.state.pool_stats = lambda: {"sqlalchemy": pool_stats(), "psycopg": all_pool_stats()}
+
+    # Include SQLAlchemy routers (existing)
+    app.include_router(auth_router.router)
+    app.include_router(blog_router.router)
+
+    # Include psycopg routers (new - for comparison)
+    app.include_router(auth_psycopg.router)
+    app.include_router(blog_psycopg.router)
+
+    app.include_router(admin_router.router)
+    app.include_router(router)
+    return app
+
+
+app = create_app()
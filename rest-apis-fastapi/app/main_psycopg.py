@@ -2,47 +2,39 @@
 Alternative main.py using psycopg2-binary instead of SQLAlchemy
 This demonstrates how to set up FastAPI with direct PostgreSQL access
 """
-from fastapi import FastAPI, status, Depends, HTTPException
+from contextlib import asynccontextmanager
+from functools import partial
+from fastapi import APIRouter, FastAPI, status, Depends, HTTPException
 from typing import Annotated
 
-from .database_psycopg import init_db
+from .database_psycopg import POOL_METRIC_FIELDS, all_pool_stats, init_db, close_pool, pool_stats, replica_stats
+from .prepared import statement_stats
 from .routers import auth_psycopg as auth_router
 from .routers import blog_psycopg as blog_router
 from .routers.auth_psycopg import get_current_user
 
 from fastapi.middleware.cors import CORSMiddleware
-
-app = FastAPI()
+from service_common.hashing import hashing_executor
+from service_common.metrics import install_metrics, observe_section, register_stats
+from service_common.query_log import QueryLogMiddleware
+from service_common.token_cache import token_cache
+from service_common import admin as admin_router
+from .blog_cache import blog_cache
+from .pagination import NEXT_CURSOR_HEADER
 
 origins = [
     "http://localhost:3000",
 ]
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers with psycopg implementation
-app.include_router(auth_router.router)
-app.include_router(blog_router.router)
-
-# Initialize database tables on startup
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database tables when the application starts"""
-    init_db()
+router = APIRouter()
 
 user_dependency = Annotated[dict, Depends(get_current_user)]
 
-@app.get("/health", status_code=status.HTTP_200_OK)
+@router.get("/health", status_code=status.HTTP_200_OK)
 async def health_check():
-    return {"status": "ok", "service": "fastapi-backend-psycopg"}
+    return {"status": "ok", "service": "fastapi-backend-psycopg", "pool": pool_stats(), "replicas": replica_stats(), "blog_cache": blog_cache.stats(), "statements": statement_stats()}
 
-@app.get("/", status_code=status.HTTP_200_OK)
+@router.get("/", status_code=status.HTTP_200_OK)
 async def user(user: user_dependency):
     if user is None:
         raise HTTPException(
@@ -50,3 +42,41 @@ async def user(user: user_dependency):
             detail="Invalid credentials"
         )
     return {"User": user}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize database tables on startup and close the pool on shutdown"""
+    init_db()
+    yield
+    close_pool()
+    hashing_executor.shutdown()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(lifespan=lifespan)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
+    )
+    app.add_middleware(QueryLogMiddleware)
+    install_metrics(app)
+    hashing_executor.observe = partial(observe_section, "bcrypt")
+    token_cache.observe = partial(observe_section, "jwt")
+    register_stats("db_pool", "pool", all_pool_stats, POOL_METRIC_FIELDS)
+    app.state.pool_stats = all_pool_stats
+
+    # Include routers with psycopg implementation
+    app.include_router(auth_router.router)
+    app.include_router(blog_router.router)
+    app.include_router(admin_router.router)
+    app.include_router(router)
+    return app
+
+
+app = create_app()
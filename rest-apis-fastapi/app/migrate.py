@@ -0,0 +1,65 @@
+"""
+Apply schema changes ahead of a deploy, so the new pods boot with a single
+checksum SELECT (and can run with SCHEMA_AUTO_MIGRATE=false).
+
+Run from rest-apis-fastapi/:
+
+    python -m app.migrate                       # SQLAlchemy schema
+    python -m app.migrate --backend psycopg     # psycopg schema (PostgreSQL)
+    python -m app.migrate --backend all --check # exit 1 if anything is stale
+"""
+import argparse
+import logging
+import sys
+
+BACKENDS = ("sqlalchemy", "psycopg")
+
+
+def migrate_sqlalchemy(check: bool, force: bool) -> bool:
+    """Returns True when the schema is (now) current."""
+    from . import migrations
+    from .database import engine
+    from service_common.schema_version import stored_checksum
+
+    declared = migrations.schema_checksum(engine)
+    if check:
+        stored = stored_checksum(engine, migrations.SCHEMA_COMPONENT)
+        print(f"sqlalchemy: stored {stored or '-'} declared {declared}")
+        return stored == declared
+    migrated = migrations.run_migrations(engine, force=force)
+    print(f"sqlalchemy: {'migrated to' if migrated else 'already at'} {declared}")
+    return True
+
+
+def migrate_psycopg(check: bool, force: bool) -> bool:
+    from .database_psycopg import close_pool, init_db, schema_checksum, stored_schema_checksum
+
+    declared = schema_checksum()
+    try:
+        if check:
+            stored = stored_schema_checksum()
+            print(f"psycopg: stored {stored or '-'} declared {declared}")
+            return stored == declared
+        migrated = init_db(force=force, auto_migrate=True)
+        print(f"psycopg: {'migrated to' if migrated else 'already at'} {declared}")
+        return True
+    finally:
+        close_pool()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=BACKENDS + ("all",), default="sqlalchemy")
+    parser.add_argument("--check", action="store_true", help="only compare checksums; exit 1 if a schema is stale")
+    parser.add_argument("--force", action="store_true", help="run the DDL even if the checksum matches")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    backends = BACKENDS if args.backend == "all" else (args.backend,)
+    runners = {"sqlalchemy": migrate_sqlalchemy, "psycopg": migrate_psycopg}
+    current = [runners[backend](args.check, args.force) for backend in backends]
+    return 0 if all(current) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
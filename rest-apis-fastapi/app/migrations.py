@@ -0,0 +1,162 @@
+"""
+Small idempotent schema upgrades for the SQLAlchemy database.
+
+``Base.metadata.create_all`` only creates missing tables, so columns added to
+existing models are brought in here. Every step checks the live schema first
+and is safe to run more than once; ``bootstrap`` only runs them when the
+declared schema changed (see schema_version.py).
+"""
+from sqlalchemy import String, inspect, text
+
+from service_common.schema_version import ensure_schema, metadata_checksum, migrate
+
+from .models import Base, Blog
+from .text_utils import EXCERPT_LENGTH, make_excerpt
+
+SCHEMA_COMPONENT = "sqlalchemy"
+# Bump whenever an upgrade step below is added or changed
+SCHEMA_REVISION = 3
+
+# Rows read and rewritten per transaction by data backfills
+BACKFILL_BATCH_SIZE = 500
+
+
+def add_blog_excerpt(conn):
+    columns = {column["name"] for column in inspect(conn).get_columns("blogs")}
+    if "excerpt" in columns:
+        return
+    conn.execute(text("ALTER TABLE blogs ADD COLUMN excerpt VARCHAR(255)"))
+
+
+def backfill_blog_excerpts(conn):
+    """
+    Fill missing excerpts, and rewrite the ones an earlier backfill cut from
+    the raw content, with make_excerpt() so they match newly created posts.
+    Reads in id-ordered batches so large tables are never loaded at once.
+    """
+    after = 0
+    while True:
+        rows = conn.execute(
+            text("SELECT id, content, excerpt FROM blogs WHERE id > :after ORDER BY id LIMIT :limit"),
+            {"after": after, "limit": BACKFILL_BATCH_SIZE},
+        ).all()
+        if not rows:
+            return
+        updates = []
+        for blog_id, content, excerpt in rows:
+            if excerpt is not None and excerpt != (content or "")[:EXCERPT_LENGTH]:
+                continue
+            rebuilt = make_excerpt(content or "")
+            if rebuilt != excerpt:
+                updates.append({"id": blog_id, "excerpt": rebuilt})
+        if updates:
+            conn.execute(text("UPDATE blogs SET excerpt = :excerpt WHERE id = :id"), updates)
+        after = rows[-1][0]
+
+
+def convert_blog_created_at(conn):
+    """created_at used to be an ISO-8601 string written in UTC."""
+    if conn.dialect.name == "sqlite":
+        # SQLite keeps the declared type; rewrite values into the format the
+        # DateTime type stores so they order and compare chronologically
+        conn.execute(text(
+            "UPDATE blogs SET created_at = replace(created_at, 'T', ' ') "
+            "WHERE created_at LIKE '%T%'"
+        ))
+        return
+
+    columns = {column["name"]: column["type"] for column in inspect(conn).get_columns("blogs")}
+    if not isinstance(columns["created_at"], String):
+        return
+    conn.execute(text(
+        "ALTER TABLE blogs ALTER COLUMN created_at TYPE TIMESTAMPTZ "
+        "USING created_at::timestamp AT TIME ZONE 'UTC'"
+    ))
+
+
+SQLITE_SEARCH_DDL = (
+    # External-content FTS5 index over blogs, kept in sync by triggers
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS blogs_fts USING fts5(
+        title, content, content='blogs', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_fts_insert AFTER INSERT ON blogs BEGIN
+        INSERT INTO blogs_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_fts_delete AFTER DELETE ON blogs BEGIN
+        INSERT INTO blogs_fts(blogs_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_fts_update AFTER UPDATE OF title, content ON blogs BEGIN
+        INSERT INTO blogs_fts(blogs_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO blogs_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+)
+
+POSTGRES_SEARCH_DDL = (
+    """
+    ALTER TABLE blogs ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_blogs_search_vector ON blogs USING GIN (search_vector)",
+)
+
+
+def add_blog_search_index(conn):
+    """Full-text index: FTS5 shadow table on SQLite, GIN-indexed tsvector on PostgreSQL."""
+    inspector = inspect(conn)
+    if conn.dialect.name == "sqlite":
+        if "blogs_fts" in inspector.get_table_names():
+            return
+        for statement in SQLITE_SEARCH_DDL:
+            conn.execute(text(statement))
+        # Index the rows that existed before the shadow table
+        conn.execute(text("INSERT INTO blogs_fts(blogs_fts) VALUES ('rebuild')"))
+        return
+
+    columns = {column["name"] for column in inspector.get_columns("blogs")}
+    if "search_vector" in columns:
+        return
+    for statement in POSTGRES_SEARCH_DDL:
+        conn.execute(text(statement))
+
+
+def add_blog_indexes(conn):
+    """create_all only indexes new tables; add indexes declared on Blog since."""
+    for index in Blog.__table__.indexes:
+        index.create(bind=conn, checkfirst=True)
+
+
+def upgrade(conn):
+    add_blog_excerpt(conn)
+    backfill_blog_excerpts(conn)
+    convert_blog_created_at(conn)
+    add_blog_search_index(conn)
+    add_blog_indexes(conn)
+
+
+def apply(conn):
+    """Every step runs on ``conn``, inside the transaction migrate() locks."""
+    Base.metadata.create_all(bind=conn)
+    upgrade(conn)
+
+
+def schema_checksum(engine) -> str:
+    return metadata_checksum(Base.metadata, engine.dialect, SCHEMA_REVISION)
+
+
+def bootstrap(engine) -> bool:
+    """Startup: one SELECT when the schema is current, the full upgrade otherwise."""
+    return ensure_schema(engine, SCHEMA_COMPONENT, schema_checksum(engine), apply)
+
+
+def run_migrations(engine, force: bool = False) -> bool:
+    return migrate(engine, SCHEMA_COMPONENT, schema_checksum(engine), apply, force=force)
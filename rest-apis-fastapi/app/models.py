@@ -1,5 +1,28 @@
 from .database import Base
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from .timeutils import as_utc
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    Timezone-aware timestamp that always round-trips as UTC.
+    PostgreSQL stores it as TIMESTAMPTZ; SQLite has no timezone support, so
+    values are stored as naive UTC there and re-tagged on load.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        value = as_utc(value)
+        if value is not None and dialect.name == "sqlite":
+            value = value.replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect):
+        return as_utc(value)
+
 
 class Users(Base):
     __tablename__ = "users"
@@ -13,8 +36,48 @@ class Blog(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String)
     content = Column(String)
+    excerpt = Column(String)  # Short plain-text preview used by list views
     slug = Column(String, unique=True, index=True)
     published = Column(Boolean, default=False)
-    created_at = Column(String)  # Storing as ISO string for simplicity
+    created_at = Column(UTCDateTime, nullable=False)
     owner_id = Column(Integer, ForeignKey("users.id"))
-    
\ No newline at end of file
+    # Load it with joinedload(Blog.owner) before reading owner_username
+    owner = relationship(Users)
+
+    __table_args__ = (
+        # Partial index serving the keyset-paginated published listing
+        Index(
+            "idx_blogs_published_created_at_id",
+            created_at.desc(),
+            id.desc(),
+            postgresql_where=published == True,
+            sqlite_where=published == True,
+        ),
+        # Serves an author's own listing (GET /blogs/mine) and owner_id lookups
+        Index("idx_blogs_owner_created_at_id", owner_id, created_at.desc(), id.desc()),
+    )
+
+    @property
+    def owner_username(self):
+        return self.owner.username if self.owner is not None else None
+
+
+class ContentVersion(Base):
+    """Version counter per cached scope, bumped by every write to that scope."""
+    __tablename__ = "content_versions"
+
+    scope = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(UTCDateTime, nullable=False)
+
+
+# Columns loaded for the summary (?fields=summary) blog listing
+BLOG_SUMMARY_COLUMNS = (
+    Blog.id,
+    Blog.title,
+    Blog.slug,
+    Blog.excerpt,
+    Blog.published,
+    Blog.created_at,
+    Blog.owner_id,
+)
@@ -0,0 +1,75 @@
+"""
+Keyset (cursor) pagination helpers shared by the blog routers.
+
+Listings are ordered by ``(created_at DESC, id DESC)``. The continuation
+token is an opaque, URL-safe encoding of the last row's sort key, so the next
+page is a range scan on the matching index instead of an OFFSET.
+"""
+import base64
+import json
+from datetime import datetime
+from operator import attrgetter
+from typing import Optional
+
+from fastapi import HTTPException, Query, Response, status
+
+from app.timeutils import as_utc
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Response header carrying the token for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, blog_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), blog_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, blog_id = json.loads(base64.urlsafe_b64decode(padded))
+        return as_utc(datetime.fromisoformat(created_at)), int(blog_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+class PageParams:
+    """Query parameters for a keyset-paginated listing."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Token from the X-Next-Cursor header of the previous page"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    ):
+        self.limit = limit
+        self.after = decode_cursor(cursor) if cursor else None
+
+
+def finish_page(rows: list, params: PageParams, response: Response, key=attrgetter("created_at", "id")) -> list:
+    """
+    Trim a result fetched with ``LIMIT params.limit + 1`` to the page size and
+    set the next-page header when there are more rows.
+    """
+    if len(rows) > params.limit:
+        rows = rows[:params.limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
+    return rows
+
+
+# Deepest offset accepted by ranked (non-keyset) listings such as search
+MAX_OFFSET = 1000
+
+
+class OffsetParams:
+    """Query parameters for ranked listings that cannot be keyset-paginated."""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        offset: int = Query(0, ge=0, le=MAX_OFFSET),
+    ):
+        self.limit = limit
+        self.offset = offset
@@ -0,0 +1,107 @@
+"""
+Server-side prepared statements for the hottest psycopg queries.
+
+psycopg2 sends every query as plain text, so PostgreSQL parses and plans the
+same user and blog lookups on each request. ``execute_prepared`` instead
+issues ``PREPARE`` the first time a statement runs on a pooled connection and
+``EXECUTE``s it by name from then on. Prepared statements live as long as the
+server session, so the set of statements known to each connection is tracked
+alongside the connection and disappears with it.
+
+Set DB_PREPARED_STATEMENTS=false when running behind a transaction-pooling
+proxy (e.g. PgBouncer), where sessions are not pinned to a client.
+"""
+import hashlib
+import os
+import threading
+import time
+import weakref
+
+DB_PREPARED_STATEMENTS = os.getenv("DB_PREPARED_STATEMENTS", "true").lower() in ("1", "true", "yes")
+
+
+def to_positional(sql: str) -> str:
+    """Rewrite psycopg ``%s`` placeholders as PostgreSQL ``$1, $2, ...``."""
+    parts = sql.split("%s")
+    return "".join(
+        part + (f"${index}" if index < len(parts) else "")
+        for index, part in enumerate(parts, start=1)
+    )
+
+
+class StatementRegistry:
+    """Prepares statements once per connection and records per-statement timings."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._statements = {}  # prepared name -> PREPARE body
+        self._stats = {}  # prepared name -> [calls, prepares, total_seconds, max_seconds]
+        self._prepared = weakref.WeakKeyDictionary()  # connection -> set of prepared names
+
+    def _register(self, name: str, sql: str) -> str:
+        # Variants of one query (e.g. optional filters) get distinct names
+        digest = hashlib.sha1(sql.encode()).hexdigest()[:8]
+        prepared_name = f"{name}_{digest}"
+        with self._lock:
+            if prepared_name not in self._statements:
+                self._statements[prepared_name] = to_positional(sql)
+                self._stats[prepared_name] = [0, 0, 0.0, 0.0]
+        return prepared_name
+
+    def _claim(self, conn, prepared_name: str) -> bool:
+        """Return True when ``prepared_name`` still has to be prepared on ``conn``."""
+        with self._lock:
+            prepared = self._prepared.setdefault(conn, set())
+            return prepared_name not in prepared
+
+    def _record(self, prepared_name: str, elapsed: float, prepared: bool):
+        with self._lock:
+            stats = self._stats[prepared_name]
+            stats[0] += 1
+            stats[1] += int(prepared)
+            stats[2] += elapsed
+            stats[3] = max(stats[3], elapsed)
+
+    def execute(self, cur, name: str, sql: str, params=()):
+        """Run ``sql`` (with ``%s`` placeholders) on ``cur`` as the prepared statement ``name``."""
+        if not self.enabled:
+            cur.execute(sql, params)
+            return
+
+        prepared_name = self._register(name, sql)
+        started = time.perf_counter()
+        must_prepare = self._claim(cur.connection, prepared_name)
+        if must_prepare:
+            cur.execute(f"PREPARE {prepared_name} AS {self._statements[prepared_name]}")
+            with self._lock:
+                self._prepared[cur.connection].add(prepared_name)
+        if params:
+            cur.execute(f"EXECUTE {prepared_name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cur.execute(f"EXECUTE {prepared_name}")
+        self._record(prepared_name, time.perf_counter() - started, must_prepare)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                prepared_name: {
+                    "calls": calls,
+                    "prepares": prepares,
+                    "total_seconds": total,
+                    "max_seconds": longest,
+                    "avg_seconds": total / calls if calls else 0.0,
+                }
+                for prepared_name, (calls, prepares, total, longest) in self._stats.items()
+            }
+
+
+statements = StatementRegistry(DB_PREPARED_STATEMENTS)
+
+
+def execute_prepared(cur, name: str, sql: str, params=()):
+    statements.execute(cur, name, sql, params)
+
+
+def statement_stats() -> dict:
+    return statements.stats()
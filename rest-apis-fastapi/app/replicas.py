@@ -0,0 +1,107 @@
+"""
+Read-replica selection shared by database.py and database_psycopg.py.
+
+When DATABASE_REPLICA_URLS lists one or more replicas, read-only dependencies
+borrow their connection from the replicas in round-robin order. A replica that
+fails to hand out a connection is skipped for DB_REPLICA_RETRY_AFTER seconds
+and the next one is tried; with every replica down, reads fall back to the
+primary. Writes always use the primary, and for DB_REPLICA_STICKY_SECONDS
+after a write made by this process reads stay on the primary too, so a client
+reading back what it just wrote does not hit a lagging replica. Conditional
+GETs read the content version on the same connection as the rows, and reads
+served by a replica never populate the process-wide caches.
+"""
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import Callable, List, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+DB_REPLICA_RETRY_AFTER = float(os.getenv("DB_REPLICA_RETRY_AFTER", "30"))
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+
+
+class ReplicaRouter:
+    """Round-robin over healthy replicas with a read-your-writes window on the primary."""
+
+    def __init__(self, replicas: List, retry_after: float, sticky_seconds: float,
+                 errors: Tuple[Type[BaseException], ...]):
+        self.replicas = list(replicas)
+        self.retry_after = retry_after
+        self.sticky_seconds = sticky_seconds
+        self.errors = errors
+        self._lock = threading.Lock()
+        self._next = itertools.cycle(range(len(self.replicas)))
+        self._down_until = [0.0] * len(self.replicas)
+        self._last_write = float("-inf")
+        self._replica_reads = 0
+        self._primary_reads = 0
+        self._failovers = 0
+
+    def note_write(self):
+        """Keep reads on the primary for ``sticky_seconds`` after a write."""
+        with self._lock:
+            self._last_write = time.monotonic()
+
+    def _candidates(self) -> List[int]:
+        now = time.monotonic()
+        with self._lock:
+            if not self.replicas or now - self._last_write < self.sticky_seconds:
+                return []
+            start = next(self._next)
+            order = [(start + offset) % len(self.replicas) for offset in range(len(self.replicas))]
+            return [index for index in order if self._down_until[index] <= now]
+
+    def _mark_down(self, index: int, error: BaseException):
+        with self._lock:
+            self._down_until[index] = time.monotonic() + self.retry_after
+            self._failovers += 1
+        logger.warning("Read replica #%d unavailable for %.0fs: %s", index, self.retry_after, error)
+
+    def _count(self, replica: bool):
+        with self._lock:
+            if replica:
+                self._replica_reads += 1
+            else:
+                self._primary_reads += 1
+
+    def connect(self, open_replica: Callable, open_primary: Callable):
+        """Return ``open_replica(replica)`` for the first healthy replica, else ``open_primary()``."""
+        for index in self._candidates():
+            try:
+                conn = open_replica(self.replicas[index])
+            except self.errors as e:
+                self._mark_down(index, e)
+                continue
+            self._count(True)
+            return conn
+        self._count(False)
+        return open_primary()
+
+    async def connect_async(self, open_replica: Callable, open_primary: Callable):
+        """Awaitable variant of connect() for async engines."""
+        for index in self._candidates():
+            try:
+                conn = await open_replica(self.replicas[index])
+            except self.errors as e:
+                self._mark_down(index, e)
+                continue
+            self._count(True)
+            return conn
+        self._count(False)
+        return await open_primary()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "replicas": len(self.replicas),
+                "healthy": sum(1 for until in self._down_until if until <= now),
+                "replica_reads": self._replica_reads,
+                "primary_reads": self._primary_reads,
+                "failovers": self._failovers,
+            }
@@ -5,9 +5,10 @@ from fastapi import Depends, HTTPException, APIRouter, status, Response, Request
 from fastapi.security import  OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from starlette import status
-from jose import jwt, JWTError
-from passlib.context import CryptContext
-from ..database import SessionLocal
+from jose import JWTError
+from ..database import SessionLocal, get_read_db
+from service_common.hashing import hash_password
+from service_common.token_cache import verify_token
 from ..utils import authenticate_user, create_access_token, create_refresh_token, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_MINUTES, get_current_user
 from ..models import Users
 from ..schemas import CreateUserRequest, Token
@@ -19,8 +20,6 @@ router = APIRouter(
     tags=["auth"]
 )
 
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 def get_db():
     db = SessionLocal()
@@ -30,13 +29,15 @@ def get_db():
         db.close()
 
 db_dependency = Annotated[Session, Depends(get_db)]
+# The /refresh user lookup may be served by a read replica
+read_db_dependency = Annotated[Session, Depends(get_read_db)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_user(create_user_request: CreateUserRequest, db: db_dependency):
     create_user_model = Users(
         username=create_user_request.username,
-        hashed_password=bcrypt_context.hash(create_user_request.password)
+        hashed_password=await hash_password(create_user_request.password)
     )
     db.add(create_user_model)
     db.commit()
@@ -50,7 +51,7 @@ async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: db_dependency
 ):
-    user = authenticate_user(form_data.username, form_data.password, db)
+    user = await authenticate_user(form_data.username, form_data.password, db)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -72,7 +73,7 @@ async def login_for_access_token(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/refresh", response_model=Token)
-async def refresh_token(request: Request, response: Response, db: db_dependency):
+async def refresh_token(request: Request, response: Response, db: read_db_dependency):
     refresh_token = request.cookies.get("refresh_token")
     if not refresh_token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token missing")
@@ -82,7 +83,7 @@ async def refresh_token(request: Request, response: Response, db: db_dependency)
         SECRET_KEY = os.getenv("SECRET_KEY")
         ALGORITHM = os.getenv("ALGORITHM")
         
-        payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = verify_token(refresh_token, SECRET_KEY, ALGORITHM)
         username: str = payload.get("sub")
         user_id: int = payload.get("id")
         
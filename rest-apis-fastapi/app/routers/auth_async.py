@@ -0,0 +1,120 @@
+"""
+Auth router on an AsyncSession.
+Same routes as routers/auth.py; mounted by main.py when USE_ASYNC_DB is enabled.
+"""
+import os
+from datetime import timedelta
+from typing import Annotated
+from fastapi import Depends, HTTPException, APIRouter, status, Response, Request
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from jose import JWTError
+from ..database import get_async_db, get_async_read_db
+from service_common.hashing import hash_password, verify_password
+from service_common.token_cache import verify_token
+from ..utils import create_access_token, create_refresh_token, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_MINUTES
+from ..models import Users
+from ..schemas import CreateUserRequest, Token
+
+
+router = APIRouter(
+    prefix="/auth",
+    tags=["auth"]
+)
+
+db_dependency = Annotated[AsyncSession, Depends(get_async_db)]
+read_db_dependency = Annotated[AsyncSession, Depends(get_async_read_db)]
+
+
+async def authenticate_user(username: str, password: str, db: AsyncSession):
+    user = await db.scalar(select(Users).where(Users.username == username))
+    # Release the connection before hashing (see utils.authenticate_user)
+    await db.close()
+    if not user or not await verify_password(password, user.hashed_password):
+        return None
+    return user
+
+
+@router.post("/", status_code=status.HTTP_201_CREATED)
+async def create_user(create_user_request: CreateUserRequest, db: db_dependency):
+    create_user_model = Users(
+        username=create_user_request.username,
+        hashed_password=await hash_password(create_user_request.password)
+    )
+    db.add(create_user_model)
+    await db.commit()
+    await db.refresh(create_user_model)
+    return create_user_model
+
+
+@router.post("/token", response_model=Token)
+async def login_for_access_token(
+    response: Response,
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    db: db_dependency
+):
+    user = await authenticate_user(form_data.username, form_data.password, db)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    access_token = create_access_token(user.username, user.id, timedelta(minutes=int(ACCESS_TOKEN_EXPIRE_MINUTES)))
+    refresh_token = create_refresh_token(user.username, user.id, timedelta(minutes=int(REFRESH_TOKEN_EXPIRE_MINUTES)))
+
+    response.set_cookie(
+        key="refresh_token",
+        value=refresh_token,
+        httponly=True,
+        secure=True,
+        samesite="lax"
+    )
+
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.post("/refresh", response_model=Token)
+async def refresh_token(request: Request, response: Response, db: read_db_dependency):
+    refresh_token = request.cookies.get("refresh_token")
+    if not refresh_token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token missing")
+
+    try:
+        SECRET_KEY = os.getenv("SECRET_KEY")
+        ALGORITHM = os.getenv("ALGORITHM")
+
+        payload = verify_token(refresh_token, SECRET_KEY, ALGORITHM)
+        username: str = payload.get("sub")
+        user_id: int = payload.get("id")
+
+        if username is None or user_id is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+        # Validate user exists
+        user = await db.get(Users, user_id)
+        if user is None:
+             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+
+        # Rotate tokens
+        new_access_token = create_access_token(user.username, user.id, timedelta(minutes=int(ACCESS_TOKEN_EXPIRE_MINUTES)))
+        new_refresh_token = create_refresh_token(user.username, user.id, timedelta(minutes=int(REFRESH_TOKEN_EXPIRE_MINUTES)))
+
+        response.set_cookie(
+            key="refresh_token",
+            value=new_refresh_token,
+            httponly=True,
+            secure=True,
+            samesite="lax"
+        )
+
+        return {"access_token": new_access_token, "token_type": "bearer"}
+
+    except JWTError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+@router.post("/logout")
+async def logout(response: Response):
+    response.delete_cookie("refresh_token")
+    return {"message": "Logged out successfully"}
@@ -6,13 +6,15 @@ import os
 from datetime import datetime, timedelta
 from typing import Annotated, Optional
 from fastapi import Depends, HTTPException, APIRouter, status, Response, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from service_common.hashing import hash_password, verify_password
+from service_common.token_cache import decode_token, verify_token
 
-from ..database_psycopg import create_connection
+from ..database_psycopg import TimedCursor, get_connection, get_read_connection, release_connection
+from ..prepared import execute_prepared
 from ..schemas import CreateUserRequest, Token
 
 router = APIRouter(
@@ -20,8 +22,6 @@ router = APIRouter(
     tags=["auth-psycopg"]
 )
 
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # Load environment variables
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
@@ -40,27 +40,33 @@ def create_refresh_token(username: str, user_id: int, expires_delta: timedelta):
     encode.update({"exp": expires})
     return jwt.encode(encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def authenticate_user(username: str, password: str) -> Optional[dict]:
-    """Authenticate user using raw SQL"""
-    conn = create_connection()
+def load_user_by_username(username: str) -> Optional[dict]:
+    conn = get_connection()
     try:
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        cur.execute(
+        cur = conn.cursor(cursor_factory=TimedCursor)
+        execute_prepared(
+            cur,
+            "user_by_username",
             "SELECT id, username, hashed_password FROM users WHERE username = %s",
             (username,)
         )
         user = cur.fetchone()
         cur.close()
-        
-        if not user:
-            return None
-        
-        if not bcrypt_context.verify(password, user["hashed_password"]):
-            return None
-        
         return user
     finally:
-        conn.close()
+        release_connection(conn)
+
+async def authenticate_user(username: str, password: str) -> Optional[dict]:
+    """Authenticate user using raw SQL"""
+    # Pool checkouts block, so they run on the thread pool rather than the event loop
+    user = await run_in_threadpool(load_user_by_username, username)
+    if not user:
+        return None
+
+    if not await verify_password(password, user["hashed_password"]):
+        return None
+
+    return user
 
 def get_current_user(request: Request) -> dict:
     """Extract and validate JWT token from Authorization header"""
@@ -74,7 +80,7 @@ def get_current_user(request: Request) -> dict:
     token = auth_header.split(" ")[1]
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token, SECRET_KEY, ALGORITHM)
         username: str = payload.get("sub")
         user_id: int = payload.get("id")
         
@@ -93,21 +99,17 @@ def get_current_user(request: Request) -> dict:
 
 user_dependency = Annotated[dict, Depends(get_current_user)]
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
-async def create_user(create_user_request: CreateUserRequest):
-    """Create a new user using raw SQL"""
-    hashed_password = bcrypt_context.hash(create_user_request.password)
-    
-    conn = create_connection()
+def insert_user(username: str, hashed_password: str) -> dict:
+    conn = get_connection()
     try:
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = conn.cursor(cursor_factory=TimedCursor)
         cur.execute(
             """
             INSERT INTO users (username, hashed_password)
             VALUES (%s, %s)
             RETURNING id, username
             """,
-            (create_user_request.username, hashed_password)
+            (username, hashed_password)
         )
         user = cur.fetchone()
         conn.commit()
@@ -120,7 +122,13 @@ async def create_user(create_user_request: CreateUserRequest):
             detail="Username already exists"
         )
     finally:
-        conn.close()
+        release_connection(conn)
+
+@router.post("/", status_code=status.HTTP_201_CREATED)
+async def create_user(create_user_request: CreateUserRequest):
+    """Create a new user using raw SQL"""
+    hashed_password = await hash_password(create_user_request.password)
+    return await run_in_threadpool(insert_user, create_user_request.username, hashed_password)
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
@@ -128,7 +136,7 @@ async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
 ):
     """Login and get access token"""
-    user = authenticate_user(form_data.username, form_data.password)
+    user = await authenticate_user(form_data.username, form_data.password)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -158,7 +166,7 @@ async def login_for_access_token(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/refresh", response_model=Token)
-async def refresh_token(request: Request, response: Response):
+def refresh_token(request: Request, response: Response):
     """Refresh access token using refresh token from cookie"""
     refresh_token = request.cookies.get("refresh_token")
     if not refresh_token:
@@ -168,7 +176,7 @@ async def refresh_token(request: Request, response: Response):
         )
 
     try:
-        payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = verify_token(refresh_token, SECRET_KEY, ALGORITHM)
         username: str = payload.get("sub")
         user_id: int = payload.get("id")
         
@@ -178,11 +186,13 @@ async def refresh_token(request: Request, response: Response):
                 detail="Invalid token"
             )
 
-        # Validate user exists using raw SQL
-        conn = create_connection()
+        # Validate user exists using raw SQL (a replica is fine here)
+        conn = get_read_connection()
         try:
-            cur = conn.cursor(cursor_factory=RealDictCursor)
-            cur.execute(
+            cur = conn.cursor(cursor_factory=TimedCursor)
+            execute_prepared(
+                cur,
+                "user_by_id",
                 "SELECT id, username FROM users WHERE id = %s",
                 (user_id,)
             )
@@ -195,7 +205,7 @@ async def refresh_token(request: Request, response: Response):
                     detail="User not found"
                 )
         finally:
-            conn.close()
+            release_connection(conn)
         
         # Rotate tokens
         new_access_token = create_access_token(
@@ -1,11 +1,46 @@
-from typing import Annotated, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Annotated, List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from app.database import SessionLocal
-from app.models import Blog
-from app.schemas import BlogCreate, BlogResponse
+from app.blog_cache import OWNER_VARIANT, blog_cache
+from app.database import SessionLocal, get_read_db, reads_may_lag
+from app.fast_json import encode_one, encode_rows, json_response
+from app.http_cache import BLOGS_SCOPE, PRIVATE_CACHE_CONTROL, Version, check_conditional
+from app.models import BLOG_SUMMARY_COLUMNS, Blog
+from app.pagination import OffsetParams, PageParams, finish_page
+from app.streaming import EXPORT_BATCH_SIZE, NDJSON_MEDIA_TYPE, blog_ndjson_line
+from app.schemas import (
+    BlogBulkCreate,
+    BlogBulkIds,
+    BlogBulkPublish,
+    BlogCreate,
+    BlogListFields,
+    BlogResponse,
+    BlogSearchResult,
+    BlogSummary,
+    BlogSummaryWithOwner,
+    BlogWithOwner,
+    BulkResult,
+    blog_list_model,
+)
+from app.crud import (
+    allocate_and_insert,
+    blog_versions,
+    bulk_delete_blogs,
+    bulk_insert_blogs,
+    bulk_publish_blogs,
+    commit_blog_write,
+    embed_owner,
+    load_version,
+    owned_blogs_statement,
+    search_blogs_statement,
+)
+from app.slugs import SlugAllocationError
+from app.text_utils import make_excerpt
+from app.timeutils import as_utc, utcnow
 from app.utils import get_current_user
 
 router = APIRouter(
@@ -21,41 +56,178 @@ def get_db():
         db.close()
 
 db_dependency = Annotated[Session, Depends(get_db)]
+# Listings and single reads may be served by a read replica
+read_db_dependency = Annotated[Session, Depends(get_read_db)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
 
+def blogs_conditional_get(request: Request, response: Response, db: read_db_dependency) -> Version:
+    # Answers revalidations with a 304 before the route queries any blog row.
+    # Shares the route's read session, so a tuned SQLite primary is never
+    # checked out (and write-locked) just to read the version, and the ETag
+    # never claims a newer version than the replica the rows come from.
+    if reads_may_lag(db):
+        version = load_version(db)
+    else:
+        version = blog_versions.get_or_load(BLOGS_SCOPE, lambda: load_version(db))
+    check_conditional(request, response, version)
+    return version
+
+# The content version the ETag was built from; cached blog bodies older than it are skipped
+version_dependency = Annotated[Version, Depends(blogs_conditional_get)]
+
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=BlogResponse)
 async def create_blog(user: user_dependency, blog_request: BlogCreate, db: db_dependency):
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication failed")
     
-    slug = blog_request.title.lower().replace(" ", "-")
-    # Simple check to ensure unique slug, though for a real app we might want more robust handling
-    existing_blog = db.query(Blog).filter(Blog.slug == slug).first()
-    if existing_blog:
-        slug = f"{slug}-{datetime.now().timestamp()}"
-
-    blog_model = Blog(
-        **blog_request.dict(),
-        slug=slug,
-        created_at=datetime.utcnow().isoformat(),
-        owner_id=user.get('id')
-    )
-    
-    db.add(blog_model)
-    db.commit()
-    db.refresh(blog_model)
-    return blog_model
+    try:
+        blog_model = allocate_and_insert(db, {
+            **blog_request.model_dump(),
+            "excerpt": make_excerpt(blog_request.content),
+            "created_at": utcnow(),
+            "owner_id": user.get('id'),
+        })
+    except SlugAllocationError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
-@router.get("/", status_code=status.HTTP_200_OK, response_model=List[BlogResponse])
-async def read_all_blogs(db: db_dependency):
-    return db.query(Blog).filter(Blog.published == True).all()
+    # Serialize before commit so the expired instance is not reloaded
+    blog = BlogResponse.model_validate(blog_model)
+    commit_blog_write(db, [blog.id])
+    return blog
 
-@router.get("/{blog_id}", status_code=status.HTTP_200_OK, response_model=BlogResponse)
-async def read_blog(blog_id: int, db: db_dependency):
-    blog_model = db.query(Blog).filter(Blog.id == blog_id).first()
-    if blog_model is None:
-        raise HTTPException(status_code=404, detail='Blog not found')
-    return blog_model
+@router.post("/bulk", status_code=status.HTTP_200_OK, response_model=BulkResult)
+async def bulk_create_blogs(user: user_dependency, bulk_request: BlogBulkCreate, db: db_dependency):
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication failed")
+
+    created_at = utcnow()
+    rows = [
+        {
+            **blog_request.model_dump(),
+            "excerpt": make_excerpt(blog_request.content),
+            "created_at": created_at,
+            "owner_id": user.get('id'),
+        }
+        for blog_request in bulk_request.blogs
+    ]
+    results = bulk_insert_blogs(db, rows)
+    commit_blog_write(db, [item["id"] for item in results if item.get("id")])
+    return {"results": results}
+
+@router.delete("/bulk", status_code=status.HTTP_200_OK, response_model=BulkResult)
+async def bulk_delete_blogs_route(user: user_dependency, bulk_request: BlogBulkIds, db: db_dependency):
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication failed")
+
+    results = bulk_delete_blogs(db, bulk_request.ids, user.get('id'))
+    commit_blog_write(db, bulk_request.ids)
+    return {"results": results}
+
+@router.post("/bulk/publish", status_code=status.HTTP_200_OK, response_model=BulkResult)
+async def bulk_publish_blogs_route(user: user_dependency, bulk_request: BlogBulkPublish, db: db_dependency):
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication failed")
+
+    results = bulk_publish_blogs(db, bulk_request.ids, user.get('id'), bulk_request.published)
+    commit_blog_write(db, bulk_request.ids)
+    return {"results": results}
+
+@router.get("/", status_code=status.HTTP_200_OK, dependencies=[Depends(blogs_conditional_get)], response_model=Union[List[BlogResponse], List[BlogSummary], List[BlogWithOwner], List[BlogSummaryWithOwner]])
+async def read_all_blogs(
+    response: Response,
+    db: read_db_dependency,
+    page: Annotated[PageParams, Depends()],
+    fields: BlogListFields = "full",
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    include_owner: bool = False,
+):
+    # The summary projection never reads the content column
+    entities = BLOG_SUMMARY_COLUMNS if fields == "summary" else (Blog,)
+    query = db.query(*entities).filter(Blog.published == True)
+    if created_after:
+        query = query.filter(Blog.created_at >= as_utc(created_after))
+    if created_before:
+        query = query.filter(Blog.created_at < as_utc(created_before))
+    if page.after:
+        query = query.filter(tuple_(Blog.created_at, Blog.id) < tuple_(*page.after))
+    if include_owner:
+        # One query for the page and its authors, not one user lookup per post
+        query = embed_owner(query, fields == "summary")
+    rows = query.order_by(Blog.created_at.desc(), Blog.id.desc()).limit(page.limit + 1).all()
+    rows = finish_page(rows, page, response)
+    return json_response(encode_rows(blog_list_model(fields, include_owner), rows), response)
+
+@router.get("/mine", status_code=status.HTTP_200_OK, response_model=Union[List[BlogResponse], List[BlogSummary]])
+async def read_my_blogs(
+    user: user_dependency,
+    response: Response,
+    db: read_db_dependency,
+    page: Annotated[PageParams, Depends()],
+    fields: BlogListFields = "full",
+    published: Optional[bool] = None,
+):
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication failed")
+
+    # Drafts are private: no shared caching, and no ETag from the public listing version
+    response.headers["Cache-Control"] = PRIVATE_CACHE_CONTROL
+    stmt = owned_blogs_statement(user.get('id'), fields == "summary", published, page.after, page.limit + 1)
+    result = db.execute(stmt)
+    rows = result.all() if fields == "summary" else result.scalars().all()
+    rows = finish_page(rows, page, response)
+    return json_response(encode_rows(BlogSummary if fields == "summary" else BlogResponse, rows), response)
+
+def export_published_blogs():
+    # The generator owns its session because it outlives the request dependencies
+    db = SessionLocal()
+    try:
+        query = (
+            db.query(Blog)
+            .filter(Blog.published == True)
+            .order_by(Blog.id)
+            .yield_per(EXPORT_BATCH_SIZE)
+        )
+        for blog in query:
+            yield blog_ndjson_line(blog)
+    finally:
+        db.close()
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_blogs():
+    return StreamingResponse(export_published_blogs(), media_type=NDJSON_MEDIA_TYPE)
+
+@router.get("/search", status_code=status.HTTP_200_OK, response_model=List[BlogSearchResult])
+async def search_blogs(
+    response: Response,
+    db: read_db_dependency,
+    page: Annotated[OffsetParams, Depends()],
+    # At least one non-blank character: a blank query has no terms to match
+    q: str = Query(min_length=1, max_length=200, pattern=r"\S"),
+):
+    stmt = search_blogs_statement(db.get_bind().dialect.name, q, page.limit, page.offset)
+    rows = (db.execute(stmt)).all()
+    return json_response(encode_rows(BlogSearchResult, rows), response)
+
+@router.get("/{blog_id}", status_code=status.HTTP_200_OK, response_model=Union[BlogResponse, BlogWithOwner])
+async def read_blog(blog_id: int, response: Response, version: version_dependency, db: read_db_dependency, include_owner: bool = False):
+    variant = OWNER_VARIANT if include_owner else ""
+    # Replica reads bypass the cache: they may predate a write that already
+    # invalidated it, and must match the version the ETag was built from
+    cacheable = not reads_may_lag(db)
+    body = blog_cache.get(blog_id, variant, version[0]) if cacheable else None
+    if body is None:
+        generation = blog_cache.generation()
+        query = db.query(Blog).filter(Blog.id == blog_id)
+        if include_owner:
+            query = embed_owner(query, summary=False)
+        blog_model = query.first()
+        if blog_model is None:
+            raise HTTPException(status_code=404, detail='Blog not found')
+        body = encode_one(BlogWithOwner if include_owner else BlogResponse, blog_model)
+        if cacheable:
+            blog_cache.put(blog_id, body, generation, variant, version[0])
+    return json_response(body, response)
 
 @router.delete("/{blog_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_blog(user: user_dependency, blog_id: int, db: db_dependency):
@@ -70,4 +242,4 @@ async def delete_blog(user: user_dependency, blog_id: int, db: db_dependency):
          raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this blog")
 
     db.query(Blog).filter(Blog.id == blog_id).delete()
-    db.commit()
+    commit_blog_write(db, [blog_id])
@@ -2,14 +2,47 @@
 Blog router using psycopg2-binary directly instead of SQLAlchemy
 This is an alternative implementation to routers/blog.py
 """
-from typing import Annotated, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Annotated, Iterable, List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from operator import itemgetter
 from datetime import datetime
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import execute_values
 
-from app.database_psycopg import create_connection
-from app.schemas import BlogCreate, BlogResponse
+from app.blog_cache import OWNER_VARIANT, blog_cache
+from app.bulk import bulk_status, claim_inserted
+from app.database_psycopg import (
+    RequestReadConnection,
+    TimedCursor,
+    get_connection,
+    get_read_connection,
+    note_primary_write,
+    release_connection,
+    request_read_connection,
+)
+from app.fast_json import encode_one, encode_rows, json_response
+from app.http_cache import BLOGS_SCOPE, HTTP_CACHE_VERSION_TTL, PRIVATE_CACHE_CONTROL, Version, VersionCache, check_conditional
+from app.pagination import OffsetParams, PageParams, finish_page
+from app.prepared import execute_prepared
+from app.streaming import EXPORT_BATCH_SIZE, NDJSON_MEDIA_TYPE, blog_ndjson_line
+from app.schemas import (
+    BlogBulkCreate,
+    BlogBulkIds,
+    BlogBulkPublish,
+    BlogCreate,
+    BlogListFields,
+    BlogResponse,
+    BlogSearchResult,
+    BlogSummary,
+    BlogSummaryWithOwner,
+    BlogWithOwner,
+    BulkResult,
+    blog_list_model,
+)
+from app.slugs import MAX_SLUG_ATTEMPTS, batch_slugs, next_slug, retry_slugs, slugify, suffix_pattern, suffix_start
+from app.text_utils import make_excerpt
+from app.timeutils import as_utc, utcnow
 
 # Import get_current_user from the psycopg auth router
 from app.routers.auth_psycopg import get_current_user
@@ -19,10 +52,145 @@ router = APIRouter(
     tags=["blogs-psycopg"]
 )
 
+# Routes that borrow a connection are plain ``def``: a checkout can block for up
+# to DB_POOL_TIMEOUT, so FastAPI must run them on its thread pool, never on the
+# event loop (where a full pool would also stall the requests holding connections).
+
 user_dependency = Annotated[dict, Depends(get_current_user)]
+# Shared by blogs_conditional_get and the routes it guards
+read_conn_dependency = Annotated[RequestReadConnection, Depends(request_read_connection)]
+
+BLOG_COLUMNS = "id, title, content, slug, published, created_at, owner_id"
+# Summary listings skip the content column entirely
+BLOG_SUMMARY_COLUMNS = "id, title, slug, excerpt, published, created_at, owner_id"
+# ?include_owner=true joins the author into the same statement
+OWNER_COLUMN = "users.username AS owner_username"
+OWNER_JOIN = "LEFT JOIN users ON users.id = blogs.owner_id"
+
+def blog_select(columns: str, include_owner: bool) -> tuple:
+    """
+    SELECT list and FROM clause for ``columns`` of blogs, table-qualified so
+    they stay unambiguous when the author is joined in.
+    """
+    columns = ", ".join(f"blogs.{name}" for name in columns.split(", "))
+    if include_owner:
+        return f"{columns}, {OWNER_COLUMN}", f"blogs {OWNER_JOIN}"
+    return columns, "blogs"
+
+# Cached content versions for the conditional GETs served by this router
+blog_versions = VersionCache(HTTP_CACHE_VERSION_TTL)
+
+def load_version(conn, scope: str = BLOGS_SCOPE) -> Version:
+    cur = conn.cursor(cursor_factory=TimedCursor)
+    execute_prepared(
+        cur,
+        "content_version",
+        "SELECT version, updated_at FROM content_versions WHERE scope = %s",
+        (scope,)
+    )
+    row = cur.fetchone()
+    cur.close()
+    return (row["version"], row["updated_at"]) if row else (0, None)
+
+def commit_blog_write(conn, cur, blog_ids: Iterable[int] = ()):
+    """Bump the blogs version in the write's transaction, commit, and drop the cached version and blogs"""
+    cur.execute(
+        """
+        INSERT INTO content_versions (scope, version, updated_at)
+        VALUES (%s, 1, now())
+        ON CONFLICT (scope) DO UPDATE
+        SET version = content_versions.version + 1, updated_at = now()
+        """,
+        (BLOGS_SCOPE,)
+    )
+    conn.commit()
+    note_primary_write()
+    blog_versions.invalidate(BLOGS_SCOPE)
+    blog_cache.invalidate(*blog_ids)
+
+def blogs_conditional_get(request: Request, response: Response, read: read_conn_dependency) -> Version:
+    # Answers revalidations with a 304 before the route queries any blog row.
+    # The version is read where the route reads its rows, so the ETag never
+    # claims a newer version than a lagging replica serves.
+    if read.may_lag():
+        version = load_version(read.get())
+    else:
+        version = blog_versions.get_or_load(BLOGS_SCOPE, lambda: load_version(read.get()))
+    check_conditional(request, response, version)
+    return version
+
+# The content version the ETag was built from; cached blog bodies older than it are skipped
+version_dependency = Annotated[Version, Depends(blogs_conditional_get)]
+
+def insert_blog(cur, row: dict, slug: str) -> Optional[dict]:
+    """
+    Insert one blog, claiming ``slug`` or the next free suffix of its title.
+    Returns the new row, or None when no slug could be allocated.
+    """
+    base = slugify(row["title"])
+    for _ in range(MAX_SLUG_ATTEMPTS):
+        # Claim the slug and insert in one statement
+        cur.execute(
+            """
+            INSERT INTO blogs (title, content, excerpt, slug, published, created_at, owner_id)
+            VALUES (%(title)s, %(content)s, %(excerpt)s, %(slug)s, %(published)s, %(created_at)s, %(owner_id)s)
+            ON CONFLICT (slug) DO NOTHING
+            RETURNING id, title, content, slug, published, created_at, owner_id
+            """,
+            {**row, "slug": slug}
+        )
+        blog = cur.fetchone()
+        if blog is not None:
+            return blog
+
+        # Slug taken: continue after the highest numeric suffix in use
+        cur.execute(
+            """
+            SELECT slug FROM blogs
+            WHERE slug LIKE %s AND ltrim(substr(slug, %s), '0123456789') = ''
+            ORDER BY length(slug) DESC, slug DESC
+            LIMIT 1
+            """,
+            (suffix_pattern(base), suffix_start(base))
+        )
+        slug = next_slug(base, (taken["slug"] for taken in cur))
+    return None
+
+def taken_slugs(cur, bases: List[str]) -> List[str]:
+    """The slug with the highest numeric suffix of each of ``bases``, in one query."""
+    cur.execute(
+        """
+        SELECT taken.slug
+        FROM unnest(%s::text[]) AS bases (base)
+        CROSS JOIN LATERAL (
+            SELECT slug FROM blogs
+            WHERE slug LIKE base || '-_%%' AND ltrim(substr(slug, length(base) + 2), '0123456789') = ''
+            ORDER BY length(slug) DESC, slug DESC
+            LIMIT 1
+        ) AS taken
+        """,
+        (sorted(set(bases)),)
+    )
+    return [row["slug"] for row in cur.fetchall()]
+
+def blog_row(blog_request: BlogCreate, owner_id: int, created_at: datetime) -> dict:
+    return {
+        "title": blog_request.title,
+        "content": blog_request.content,
+        "excerpt": make_excerpt(blog_request.content),
+        "published": blog_request.published,
+        "created_at": created_at,
+        "owner_id": owner_id,
+    }
+
+def existing_ids(cur, ids: List[int]) -> set:
+    if not ids:
+        return set()
+    cur.execute("SELECT id FROM blogs WHERE id = ANY(%s)", (ids,))
+    return {row["id"] for row in cur.fetchall()}
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=BlogResponse)
-async def create_blog(user: user_dependency, blog_request: BlogCreate):
+def create_blog(user: user_dependency, blog_request: BlogCreate):
     """Create a new blog post using raw SQL"""
     if user is None:
         raise HTTPException(
@@ -30,99 +198,316 @@ async def create_blog(user: user_dependency, blog_request: BlogCreate):
             detail="Authentication failed"
         )
     
-    # Generate slug from title
-    slug = blog_request.title.lower().replace(" ", "-")
+    row = blog_row(blog_request, user.get('id'), utcnow())
     
-    conn = create_connection()
+    conn = get_connection()
     try:
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Check if slug exists
-        cur.execute(
-            "SELECT id FROM blogs WHERE slug = %s",
-            (slug,)
+        cur = conn.cursor(cursor_factory=TimedCursor)
+        blog = insert_blog(cur, row, slugify(blog_request.title))
+        if blog is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Could not allocate a slug for {blog_request.title!r}"
+            )
+        commit_blog_write(conn, cur, [blog["id"]])
+        cur.close()
+        return blog
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        release_connection(conn)
+
+@router.post("/bulk", status_code=status.HTTP_200_OK, response_model=BulkResult)
+def bulk_create_blogs(user: user_dependency, bulk_request: BlogBulkCreate):
+    """Create many blogs with a multi-row INSERT (execute_values), retrying slug conflicts as a batch"""
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication failed"
         )
-        existing_blog = cur.fetchone()
-        
-        # Make slug unique if it already exists
-        if existing_blog:
-            slug = f"{slug}-{int(datetime.now().timestamp())}"
+    
+    created_at = utcnow()
+    rows = [blog_row(blog_request, user.get('id'), created_at) for blog_request in bulk_request.blogs]
+    slugs = batch_slugs(row["title"] for row in rows)
+    
+    conn = get_connection()
+    try:
+        cur = conn.cursor(cursor_factory=TimedCursor)
+        pending = [(index, {**row, "slug": slug}) for index, (row, slug) in enumerate(zip(rows, slugs))]
+        results = [{"status": "conflict"}] * len(rows)
+        for attempt in range(MAX_SLUG_ATTEMPTS):
+            if attempt:
+                # Slugs already taken: retry every such item with its next free suffix
+                pending = retry_slugs(pending, taken_slugs(cur, [slugify(row["title"]) for _, row in pending]))
+            inserted = execute_values(
+                cur,
+                """
+                INSERT INTO blogs (title, content, excerpt, slug, published, created_at, owner_id)
+                VALUES %s
+                ON CONFLICT (slug) DO NOTHING
+                RETURNING id, slug
+                """,
+                [row for _, row in pending],
+                template="(%(title)s, %(content)s, %(excerpt)s, %(slug)s, %(published)s, %(created_at)s, %(owner_id)s)",
+                page_size=len(pending),
+                fetch=True
+            )
+            pending = claim_inserted(pending, {row["slug"]: row["id"] for row in inserted}, results)
+            if not pending:
+                break
         
-        # Insert new blog
+        commit_blog_write(conn, cur, [item["id"] for item in results if item.get("id")])
+        cur.close()
+        return {"results": results}
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        release_connection(conn)
+
+@router.delete("/bulk", status_code=status.HTTP_200_OK, response_model=BulkResult)
+def bulk_delete_blogs(user: user_dependency, bulk_request: BlogBulkIds):
+    """Delete the caller's blogs among the given ids in one statement"""
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication failed"
+        )
+    
+    ids = list(dict.fromkeys(bulk_request.ids))
+    conn = get_connection()
+    try:
+        cur = conn.cursor(cursor_factory=TimedCursor)
         cur.execute(
-            """
-            INSERT INTO blogs (title, content, slug, published, created_at, owner_id)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            RETURNING id, title, content, slug, published, created_at, owner_id
-            """,
-            (
-                blog_request.title,
-                blog_request.content,
-                slug,
-                blog_request.published,
-                datetime.utcnow().isoformat(),
-                user.get('id')
-            )
+            "DELETE FROM blogs WHERE id = ANY(%s) AND owner_id = %s RETURNING id",
+            (ids, user.get('id'))
         )
-        blog = cur.fetchone()
-        conn.commit()
+        affected = {row["id"] for row in cur.fetchall()}
+        existing = existing_ids(cur, [blog_id for blog_id in ids if blog_id not in affected])
+        commit_blog_write(conn, cur, ids)
         cur.close()
-        return blog
+        return {"results": bulk_status(ids, affected, existing, "deleted")}
     except Exception:
         conn.rollback()
         raise
     finally:
-        conn.close()
+        release_connection(conn)
 
-@router.get("/", status_code=status.HTTP_200_OK, response_model=List[BlogResponse])
-async def read_all_blogs():
-    """Get all published blogs using raw SQL"""
-    conn = create_connection()
+@router.post("/bulk/publish", status_code=status.HTTP_200_OK, response_model=BulkResult)
+def bulk_publish_blogs(user: user_dependency, bulk_request: BlogBulkPublish):
+    """Publish or unpublish the caller's blogs among the given ids in one statement"""
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication failed"
+        )
+    
+    ids = list(dict.fromkeys(bulk_request.ids))
+    conn = get_connection()
     try:
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = conn.cursor(cursor_factory=TimedCursor)
         cur.execute(
-            """
-            SELECT id, title, content, slug, published, created_at, owner_id
+            "UPDATE blogs SET published = %s WHERE id = ANY(%s) AND owner_id = %s RETURNING id",
+            (bulk_request.published, ids, user.get('id'))
+        )
+        affected = {row["id"] for row in cur.fetchall()}
+        existing = existing_ids(cur, [blog_id for blog_id in ids if blog_id not in affected])
+        commit_blog_write(conn, cur, ids)
+        cur.close()
+        return {"results": bulk_status(ids, affected, existing, "updated")}
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        release_connection(conn)
+
+@router.get("/", status_code=status.HTTP_200_OK, dependencies=[Depends(blogs_conditional_get)], response_model=Union[List[BlogResponse], List[BlogSummary], List[BlogWithOwner], List[BlogSummaryWithOwner]])
+def read_all_blogs(
+    response: Response,
+    read: read_conn_dependency,
+    page: Annotated[PageParams, Depends()],
+    fields: BlogListFields = "full",
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    include_owner: bool = False,
+):
+    """Get a page of published blogs using raw SQL (keyset pagination)"""
+    columns, source = blog_select(BLOG_SUMMARY_COLUMNS if fields == "summary" else BLOG_COLUMNS, include_owner)
+    conditions = ["blogs.published = TRUE"]
+    params = []
+    if created_after:
+        conditions.append("blogs.created_at >= %s")
+        params.append(as_utc(created_after))
+    if created_before:
+        conditions.append("blogs.created_at < %s")
+        params.append(as_utc(created_before))
+    if page.after:
+        conditions.append("(blogs.created_at, blogs.id) < (%s, %s)")
+        params.extend(page.after)
+    params.append(page.limit + 1)
+
+    cur = read.get().cursor(cursor_factory=TimedCursor)
+    # Each combination of fields and filters is prepared as its own statement
+    execute_prepared(
+        cur,
+        "published_blogs_page",
+        f"""
+        SELECT {columns}
+        FROM {source}
+        WHERE {" AND ".join(conditions)}
+        ORDER BY blogs.created_at DESC, blogs.id DESC
+        LIMIT %s
+        """,
+        params
+    )
+    blogs = cur.fetchall()
+    cur.close()
+    blogs = finish_page(blogs, page, response, key=itemgetter("created_at", "id"))
+    return json_response(encode_rows(blog_list_model(fields, include_owner), blogs), response)
+
+@router.get("/mine", status_code=status.HTTP_200_OK, response_model=Union[List[BlogResponse], List[BlogSummary]])
+def read_my_blogs(
+    user: user_dependency,
+    response: Response,
+    page: Annotated[PageParams, Depends()],
+    fields: BlogListFields = "full",
+    published: Optional[bool] = None,
+):
+    """Get a page of the current user's blogs, drafts included (keyset pagination)"""
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication failed")
+
+    columns = BLOG_SUMMARY_COLUMNS if fields == "summary" else BLOG_COLUMNS
+    # Range scan on idx_blogs_owner_created_at_id
+    conditions = ["owner_id = %s"]
+    params = [user.get('id')]
+    if published is not None:
+        conditions.append("published = %s")
+        params.append(published)
+    if page.after:
+        conditions.append("(created_at, id) < (%s, %s)")
+        params.extend(page.after)
+    params.append(page.limit + 1)
+
+    # Drafts are private: no shared caching, and no ETag from the public listing version
+    response.headers["Cache-Control"] = PRIVATE_CACHE_CONTROL
+    conn = get_read_connection()
+    try:
+        cur = conn.cursor(cursor_factory=TimedCursor)
+        execute_prepared(
+            cur,
+            "owned_blogs_page",
+            f"""
+            SELECT {columns}
             FROM blogs
-            WHERE published = TRUE
-            ORDER BY created_at DESC
-            """
+            WHERE {" AND ".join(conditions)}
+            ORDER BY created_at DESC, id DESC
+            LIMIT %s
+            """,
+            params
         )
         blogs = cur.fetchall()
         cur.close()
-        return blogs
+        blogs = finish_page(blogs, page, response, key=itemgetter("created_at", "id"))
+        return json_response(encode_rows(BlogSummary if fields == "summary" else BlogResponse, blogs), response)
+    finally:
+        release_connection(conn)
+
+def export_published_blogs():
+    """Stream published blogs through a named (server-side) cursor"""
+    conn = get_connection()
+    try:
+        cur = conn.cursor(name="blogs_export", cursor_factory=TimedCursor)
+        cur.itersize = EXPORT_BATCH_SIZE
+        try:
+            cur.execute(
+                """
+                SELECT id, title, content, slug, published, created_at, owner_id
+                FROM blogs
+                WHERE published = TRUE
+                ORDER BY id
+                """
+            )
+            for blog in cur:
+                yield blog_ndjson_line(blog)
+        finally:
+            cur.close()
     finally:
-        conn.close()
+        release_connection(conn)
 
-@router.get("/{blog_id}", status_code=status.HTTP_200_OK, response_model=BlogResponse)
-async def read_blog(blog_id: int):
-    """Get a specific blog by ID using raw SQL"""
-    conn = create_connection()
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_blogs():
+    """Export all published blogs as newline-delimited JSON"""
+    return StreamingResponse(export_published_blogs(), media_type=NDJSON_MEDIA_TYPE)
+
+@router.get("/search", status_code=status.HTTP_200_OK, response_model=List[BlogSearchResult])
+def search_blogs(
+    response: Response,
+    page: Annotated[OffsetParams, Depends()],
+    # At least one non-blank character: a blank query has no terms to match
+    q: str = Query(min_length=1, max_length=200, pattern=r"\S"),
+):
+    """Ranked full-text search over published blogs (GIN-indexed tsvector)"""
+    conn = get_read_connection()
     try:
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = conn.cursor(cursor_factory=TimedCursor)
         cur.execute(
-            """
-            SELECT id, title, content, slug, published, created_at, owner_id
-            FROM blogs
-            WHERE id = %s
+            f"""
+            SELECT {BLOG_SUMMARY_COLUMNS}, ts_rank_cd(search_vector, query) AS rank
+            FROM blogs, websearch_to_tsquery('english', %s) AS query
+            WHERE search_vector @@ query AND published = TRUE
+            ORDER BY rank DESC, id DESC
+            LIMIT %s OFFSET %s
             """,
-            (blog_id,)
+            (q, page.limit, page.offset)
         )
-        blog = cur.fetchone()
+        blogs = cur.fetchall()
         cur.close()
-        
-        if blog is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail='Blog not found'
-            )
-        
-        return blog
+        return json_response(encode_rows(BlogSearchResult, blogs), response)
     finally:
-        conn.close()
+        release_connection(conn)
+
+@router.get("/{blog_id}", status_code=status.HTTP_200_OK, response_model=Union[BlogResponse, BlogWithOwner])
+def read_blog(blog_id: int, response: Response, version: version_dependency, read: read_conn_dependency, include_owner: bool = False):
+    """Get a specific blog by ID using raw SQL, served from blog_cache when warm"""
+    variant = OWNER_VARIANT if include_owner else ""
+    # Replica reads bypass the cache: they may predate a write that already
+    # invalidated it, and must match the version the ETag was built from
+    cacheable = not read.may_lag()
+    cached = blog_cache.get(blog_id, variant, version[0]) if cacheable else None
+    if cached is not None:
+        return json_response(cached, response)
+    
+    columns, source = blog_select(BLOG_COLUMNS, include_owner)
+    generation = blog_cache.generation()
+    cur = read.get().cursor(cursor_factory=TimedCursor)
+    execute_prepared(
+        cur,
+        "blog_by_id",
+        f"""
+        SELECT {columns}
+        FROM {source}
+        WHERE blogs.id = %s
+        """,
+        (blog_id,)
+    )
+    blog = cur.fetchone()
+    cur.close()
+    
+    if blog is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Blog not found'
+        )
+    
+    body = encode_one(BlogWithOwner if include_owner else BlogResponse, blog)
+    if cacheable:
+        blog_cache.put(blog_id, body, generation, variant, version[0])
+    return json_response(body, response)
 
 @router.delete("/{blog_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_blog(user: user_dependency, blog_id: int):
+def delete_blog(user: user_dependency, blog_id: int):
     """Delete a blog post using raw SQL"""
     if user is None:
         raise HTTPException(
@@ -130,9 +515,9 @@ async def delete_blog(user: user_dependency, blog_id: int):
             detail="Authentication failed"
         )
     
-    conn = create_connection()
+    conn = get_connection()
     try:
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = conn.cursor(cursor_factory=TimedCursor)
         
         # First, check if blog exists and get owner_id
         cur.execute(
@@ -159,7 +544,7 @@ async def delete_blog(user: user_dependency, blog_id: int):
             "DELETE FROM blogs WHERE id = %s",
             (blog_id,)
         )
-        conn.commit()
+        commit_blog_write(conn, cur, [blog_id])
         cur.close()
     except HTTPException:
         raise
@@ -167,5 +552,5 @@ async def delete_blog(user: user_dependency, blog_id: int):
         conn.rollback()
         raise
     finally:
-        conn.close()
+        release_connection(conn)
 
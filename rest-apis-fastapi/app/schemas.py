@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class CreateUserRequest(BaseModel):
@@ -18,10 +20,62 @@ class BlogCreate(BlogBase):
     pass
 
 class BlogResponse(BlogBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     slug: str
-    created_at: str
+    created_at: datetime
     owner_id: int
 
-    class Config:
-        orm_mode = True
+class BlogSummary(BaseModel):
+    """List-view projection of a blog: everything but the full content."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    published: bool
+    created_at: datetime
+    owner_id: int
+
+class BlogWithOwner(BlogResponse):
+    """BlogResponse with the author's username embedded (?include_owner=true)."""
+    owner_username: Optional[str] = None
+
+class BlogSummaryWithOwner(BlogSummary):
+    owner_username: Optional[str] = None
+
+class BlogSearchResult(BlogSummary):
+    # Relevance score; higher is a better match
+    rank: float
+
+# Value of the ?fields= query parameter on blog listings
+BlogListFields = Literal["full", "summary"]
+
+def blog_list_model(fields: BlogListFields, include_owner: bool = False):
+    """Item model of a blog listing for its ?fields= and ?include_owner= values."""
+    if fields == "summary":
+        return BlogSummaryWithOwner if include_owner else BlogSummary
+    return BlogWithOwner if include_owner else BlogResponse
+
+# Largest number of items accepted by one bulk request
+BULK_MAX_ITEMS = 500
+
+class BlogBulkCreate(BaseModel):
+    blogs: List[BlogCreate] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BlogBulkIds(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BlogBulkPublish(BlogBulkIds):
+    published: bool = True
+
+class BulkItemResult(BaseModel):
+    id: Optional[int] = None
+    slug: Optional[str] = None
+    # created | deleted | updated | not_found | forbidden | conflict
+    status: str
+
+class BulkResult(BaseModel):
+    results: List[BulkItemResult]
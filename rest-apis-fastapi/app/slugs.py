@@ -0,0 +1,102 @@
+"""
+Slug generation shared by the SQLAlchemy and psycopg blog routers.
+
+A new blog is inserted with ``ON CONFLICT (slug) DO NOTHING``, so the common
+case (the slug is free) costs a single statement. Only when the slug is taken
+do we look up the highest numeric suffix in use and retry with the next one
+(``my-post``, ``my-post-2``, ``my-post-3``, ...). A retry also covers a
+concurrent insert that grabbed the same slug in between.
+"""
+import re
+import unicodedata
+from typing import Iterable, List
+
+SLUG_MAX_LENGTH = 80
+
+# Upper bound on insert attempts when concurrent posts keep taking our slug
+MAX_SLUG_ATTEMPTS = 5
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+class SlugAllocationError(Exception):
+    """Raised when no free slug could be claimed within MAX_SLUG_ATTEMPTS."""
+
+
+def slugify(title: str) -> str:
+    """
+    Normalize a title to a URL slug: ASCII-fold accents, lowercase, and join
+    alphanumeric runs with single dashes.
+    """
+    text = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode()
+    slug = _NON_ALNUM.sub("-", text.lower()).strip("-")
+    slug = slug[:SLUG_MAX_LENGTH].rstrip("-")
+    return slug or "post"
+
+
+def suffix_pattern(base: str) -> str:
+    """LIKE pattern matching every suffixed variant of ``base``."""
+    # Slugs only contain [a-z0-9-], so nothing needs escaping
+    return f"{base}-_%"
+
+
+def suffix_start(base: str) -> int:
+    """1-based position of the suffix in ``base-N``, for SQL substr()."""
+    return len(base) + 2
+
+
+def next_slug(base: str, taken: Iterable[str]) -> str:
+    """
+    Return ``base-N`` for the first N above every numeric suffix in ``taken``.
+    ``taken`` should be ordered by (length DESC, slug DESC) so the first
+    numeric match is the highest one; the lookups only fetch that one row.
+    """
+    suffix = re.compile(rf"^{re.escape(base)}-(\d+)$")
+    for slug in taken:
+        match = suffix.match(slug)
+        if match:
+            return f"{base}-{int(match.group(1)) + 1}"
+    return f"{base}-2"
+
+
+def next_slugs(bases: List[str], taken: Iterable[str]) -> List[str]:
+    """
+    next_slug() for a batch of rows whose slugs were taken: ``taken`` holds
+    the highest suffixed slug of each distinct base, and rows sharing a base
+    get consecutive suffixes.
+    """
+    taken = list(taken)
+    suffixes = {}
+    slugs = []
+    for base in bases:
+        if base in suffixes:
+            suffixes[base] += 1
+        else:
+            suffixes[base] = int(next_slug(base, taken).rsplit("-", 1)[1])
+        slugs.append(f"{base}-{suffixes[base]}")
+    return slugs
+
+
+def batch_slugs(titles: Iterable[str]) -> List[str]:
+    """
+    Slugify a batch of titles, suffixing repeats within the batch so every
+    slug in the result is distinct. Clashes with existing rows are left to
+    the ON CONFLICT insert.
+    """
+    used = set()
+    slugs = []
+    for title in titles:
+        base = slugify(title)
+        slug, n = base, 1
+        while slug in used:
+            n += 1
+            slug = f"{base}-{n}"
+        used.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def retry_slugs(pending: List[tuple], taken: Iterable[str]) -> List[tuple]:
+    """Give each (index, row) in ``pending`` the next free suffix of its title."""
+    bases = [slugify(row["title"]) for _, row in pending]
+    return [(index, {**row, "slug": slug}) for (index, row), slug in zip(pending, next_slugs(bases, taken))]
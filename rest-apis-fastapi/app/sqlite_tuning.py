@@ -0,0 +1,75 @@
+"""
+Opt-in high-throughput profile for file-backed SQLite (SQLITE_PERFORMANCE=true).
+
+Every new connection is switched to WAL journaling with synchronous=NORMAL,
+a memory map, a larger page cache and a busy timeout. The primary engine
+starts its transactions with ``BEGIN IMMEDIATE``: the write lock is taken up
+front (waiting up to the busy timeout) instead of being upgraded
+mid-transaction, which is what produces ``database is locked`` under
+concurrent writers. Writers therefore queue on SQLite's lock, not on a
+one-connection pool: a request holding the only connection while another
+waits for it on the event loop thread never gets to release it. Reads get
+their own pool of ``query_only`` connections, which WAL lets run alongside
+the writer; the database module plugs it in as a local read replica (see
+replicas.py), and read paths must stay on it, since any primary transaction
+takes the write lock.
+
+Without the flag nothing changes, and the profile never applies to
+in-memory databases.
+"""
+import os
+
+from sqlalchemy import event
+
+from service_common.db_pool import is_file_database
+
+SQLITE_PERFORMANCE = os.getenv("SQLITE_PERFORMANCE", "false").lower() in ("1", "true", "yes")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# Page cache per connection, in KiB
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "4"))
+
+
+def enabled_for(url: str) -> bool:
+    return SQLITE_PERFORMANCE and is_file_database(url)
+
+
+def reader_pool_options() -> dict:
+    # Reader connections are cheap file handles: bursts open extra ones instead
+    # of waiting, since a request blocked on checkout may be holding up the
+    # requests that would return a connection
+    return {"pool_size": SQLITE_READ_POOL_SIZE, "max_overflow": -1}
+
+
+def connection_pragmas(writer: bool) -> list:
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if not writer:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def apply_profile(engine, writer: bool):
+    """Tune every connection ``engine`` (sync or async) opens from now on."""
+    engine = getattr(engine, "sync_engine", engine)
+    pragmas = connection_pragmas(writer)
+
+    @event.listens_for(engine, "connect")
+    def configure(dbapi_connection, connection_record):
+        # Let SQLAlchemy, not the driver, decide when transactions begin
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE" if writer else "BEGIN")
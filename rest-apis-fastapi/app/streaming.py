@@ -0,0 +1,18 @@
+"""
+Helpers for newline-delimited JSON (NDJSON) export endpoints.
+
+Rows are fetched in batches of EXPORT_BATCH_SIZE and written out one line at a
+time, so memory stays bounded no matter how large the table is.
+"""
+import os
+
+from app.schemas import BlogResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+
+def blog_ndjson_line(blog) -> str:
+    """Serialize an ORM object or a dict row as one NDJSON line."""
+    return BlogResponse.model_validate(blog).model_dump_json() + "\n"
@@ -0,0 +1,14 @@
+"""
+Text helpers for blog content.
+"""
+
+EXCERPT_LENGTH = 200
+
+
+def make_excerpt(content: str, length: int = EXCERPT_LENGTH) -> str:
+    """Collapse whitespace and cut ``content`` to ``length`` characters on a word boundary."""
+    text = " ".join(content.split())
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(" ", 1)[0] or text[:length]
+    return cut.rstrip(" .,;:") + "…"
@@ -0,0 +1,18 @@
+"""
+Timezone helpers. Timestamps are stored and compared in UTC.
+"""
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive datetimes as UTC and convert aware ones to UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
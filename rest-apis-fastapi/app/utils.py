@@ -6,7 +6,8 @@ from typing import Optional
 from .models import Users
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from service_common.hashing import verify_password
+from service_common.token_cache import decode_token
 
 
 
@@ -16,7 +17,6 @@ ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
 REFRESH_TOKEN_EXPIRE_MINUTES = os.getenv("REFRESH_TOKEN_EXPIRE_MINUTES")
 
 
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="auth/token",
     scheme_name="Login with username & password"
@@ -29,9 +29,13 @@ bearer_scheme = HTTPBearer(
 
 
 
-def authenticate_user(username: str, password: str, db: Session):
+async def authenticate_user(username: str, password: str, db: Session):
     user = db.query(Users).filter(Users.username == username).first()
-    if not user or not bcrypt_context.verify(password, user.hashed_password):
+    # End the transaction before the slow hash check: under SQLITE_PERFORMANCE
+    # it began with BEGIN IMMEDIATE and would hold the write lock for the whole
+    # bcrypt call. Closing detaches ``user`` with its loaded columns intact.
+    db.close()
+    if not user or not await verify_password(password, user.hashed_password):
         return None
     return user
 
@@ -72,7 +76,7 @@ def get_current_user(
         )
 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token, SECRET_KEY, ALGORITHM)
         return {
             "username": payload.get("sub"),
             "id": payload.get("id")
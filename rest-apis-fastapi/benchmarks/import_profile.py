@@ -0,0 +1,149 @@
+"""
+Cold-start profile of the services: how long importing each app module
+(without its module-level ``app = create_app()``), building the app once with
+create_app() and running its lifespan startup take, and which top-level
+packages the import time goes to (``python -X importtime``).
+
+Every measurement runs in a fresh interpreter, so nothing is already imported.
+Run from rest-apis-fastapi/:
+
+    python -m benchmarks.import_profile
+    python -m benchmarks.import_profile --apps main jwt-auth --startup --top 15
+    python -m benchmarks.import_profile --output import-profile.json
+
+DATABASE_URL defaults to a throwaway SQLite file so the SQLAlchemy apps can
+run their startup without a server; the psycopg apps need a real PostgreSQL
+DATABASE_URL for --startup.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+SERVICE_ROOT = Path(__file__).resolve().parent.parent
+REPO_ROOT = SERVICE_ROOT.parent
+
+# name -> (working directory, module exposing create_app)
+APPS = {
+    "main": (SERVICE_ROOT, "app.main"),
+    "psycopg": (SERVICE_ROOT, "app.main_psycopg"),
+    "combined": (SERVICE_ROOT, "app.main_combined_example"),
+    "jwt-auth": (REPO_ROOT / "jwt-auth", "main"),
+    "okta": (REPO_ROOT / "okta-vite-fastapi" / "backend", "main"),
+}
+
+# Runs inside the child interpreter; prints one JSON line with the phase timings.
+# Every app module ends with ``app = create_app()``, so a plain import would
+# build the app too (and a second create_app() call would only time a warm
+# rebuild). The module body is run without that statement, then the app is
+# built once on its own.
+PROBE = """
+import ast, asyncio, importlib.util, json, sys, time
+started = time.perf_counter()
+spec = importlib.util.find_spec(sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = module
+tree = ast.parse(spec.loader.get_source(spec.name))
+tree.body = [
+    node for node in tree.body
+    if not (isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)
+            and getattr(node.value.func, "id", None) == "create_app")
+]
+exec(compile(tree, spec.origin, "exec"), module.__dict__)
+imported = time.perf_counter()
+app = module.app = module.create_app()
+created = time.perf_counter()
+startup = None
+if sys.argv[2] == "1":
+    async def run_startup():
+        async with app.router.lifespan_context(app):
+            return time.perf_counter()
+    startup = asyncio.run(run_startup()) - created
+print(json.dumps({"import_seconds": imported - started, "create_app_seconds": created - imported, "startup_seconds": startup}))
+"""
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Sum the self time (seconds) of every imported module per top-level package."""
+    totals = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|")
+        totals[name.strip().split(".")[0]] += int(self_us) / 1e6
+    return totals
+
+
+def profile(name: str, startup: bool, env: dict) -> dict:
+    cwd, module = APPS[name]
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", PROBE, module, "1" if startup else "0"],
+        cwd=cwd,
+        env={**env, "PYTHONPATH": str(cwd)},
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        # Import-time lines share stderr with the traceback; show only the latter
+        error = [line for line in completed.stderr.splitlines() if not line.startswith("import time:")]
+        return {"app": name, "error": "\n".join(error[-5:])}
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["app"] = name
+    result["packages"] = parse_importtime(completed.stderr)
+    return result
+
+
+def best_of(runs: list) -> dict:
+    """Keep the fastest run: later runs benefit from the OS file cache, like a warm node."""
+    ok = [run for run in runs if "error" not in run]
+    if not ok:
+        return runs[-1]
+    return min(ok, key=lambda run: run["import_seconds"] + run["create_app_seconds"] + (run["startup_seconds"] or 0))
+
+
+def print_report(results: list, top: int):
+    for result in results:
+        print(f"== {result['app']}")
+        if "error" in result:
+            print(f"   failed: {result['error']}")
+            continue
+        print(f"   import      {result['import_seconds'] * 1000:8.1f} ms")
+        print(f"   create_app  {result['create_app_seconds'] * 1000:8.1f} ms")
+        if result["startup_seconds"] is not None:
+            print(f"   startup     {result['startup_seconds'] * 1000:8.1f} ms")
+        packages = sorted(result["packages"].items(), key=lambda item: item[1], reverse=True)[:top]
+        print("   heaviest packages (self import time):")
+        for package, seconds in packages:
+            print(f"     {package:<28} {seconds * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", nargs="+", choices=sorted(APPS), default=["main", "jwt-auth", "okta"])
+    parser.add_argument("--startup", action="store_true", help="also run each app's lifespan startup")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per app; the fastest is reported")
+    parser.add_argument("--top", type=int, default=10, help="packages listed per app")
+    parser.add_argument("--output", help="also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if not env.get("DATABASE_URL"):
+        database = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        database.close()
+        env["DATABASE_URL"] = f"sqlite:///{database.name}"
+    env.setdefault("SECRET_KEY", "import-profile")
+    env.setdefault("ALGORITHM", "HS256")
+
+    results = [best_of([profile(name, args.startup, env) for _ in range(args.repeat)]) for name in args.apps]
+    print_report(results, args.top)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Microbenchmark: serializing a blog listing page, before and after the
+single-pass JSON path (app/fast_json.py).
+
+  before  validate rows against response_model, jsonable_encoder, json.dumps
+  after   fast_json.encode_rows (validate from attributes + dump_json in one go)
+
+Run from rest-apis-fastapi/:
+
+    python -m benchmarks.list_serialization --rows 100 --repeat 200
+"""
+import argparse
+import json
+import os
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+# Only the models are needed; keep app.database from requiring a real server
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.fast_json import encode_rows  # noqa: E402
+from app.models import Blog  # noqa: E402
+from app.schemas import BlogResponse, BlogSummary  # noqa: E402
+from app.text_utils import make_excerpt  # noqa: E402
+
+
+def make_rows(count: int):
+    now = datetime.now(timezone.utc)
+    content = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40
+    orm_rows = [
+        Blog(
+            id=i,
+            title=f"Post number {i}",
+            content=content,
+            excerpt=make_excerpt(content),
+            slug=f"post-number-{i}",
+            published=True,
+            created_at=now - timedelta(minutes=i),
+            owner_id=1,
+        )
+        for i in range(count)
+    ]
+    # RealDictCursor rows, as returned by the psycopg router
+    dict_rows = [
+        {column: getattr(blog, column) for column in
+         ("id", "title", "content", "excerpt", "slug", "published", "created_at", "owner_id")}
+        for blog in orm_rows
+    ]
+    return orm_rows, dict_rows
+
+
+RESPONSE_MODELS = {model: TypeAdapter(List[model]) for model in (BlogResponse, BlogSummary)}
+
+
+def before(model, rows) -> bytes:
+    validated = RESPONSE_MODELS[model].validate_python(rows, from_attributes=True)
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def after(model, rows) -> bytes:
+    return encode_rows(model, rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="rows per page")
+    parser.add_argument("--repeat", type=int, default=200, help="pages serialized per measurement")
+    args = parser.parse_args()
+
+    orm_rows, dict_rows = make_rows(args.rows)
+    cases = [
+        ("full / ORM objects", BlogResponse, orm_rows),
+        ("full / dict rows", BlogResponse, dict_rows),
+        ("summary / ORM objects", BlogSummary, orm_rows),
+        ("summary / dict rows", BlogSummary, dict_rows),
+    ]
+
+    print(f"{args.rows} rows per page, best of 5 x {args.repeat} pages")
+    print(f"{'case':<24}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name, model, rows in cases:
+        assert json.loads(before(model, rows)) == json.loads(after(model, rows))
+        slow = min(timeit.repeat(lambda: before(model, rows), number=args.repeat, repeat=5)) / args.repeat
+        fast = min(timeit.repeat(lambda: after(model, rows), number=args.repeat, repeat=5)) / args.repeat
+        print(f"{name:<24}{slow * 1000:>12.3f}{fast * 1000:>12.3f}{slow / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
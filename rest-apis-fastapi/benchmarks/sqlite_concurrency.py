@@ -0,0 +1,213 @@
+"""
+Concurrency benchmark for the SQLite performance profile (app/sqlite_tuning.py).
+
+Several worker processes (like ``uvicorn --workers``), each with a few
+threads, hammer one SQLite file through app.database: writers insert blogs
+in read-then-write transactions, readers page through the latest posts via
+get_read_db(). The same workload runs once with the default settings and
+once with SQLITE_PERFORMANCE=true, each on a fresh database file, and the
+report counts completed operations, ``database is locked`` failures and
+latency percentiles.
+
+Run from rest-apis-fastapi/:
+
+    python -m benchmarks.sqlite_concurrency
+    python -m benchmarks.sqlite_concurrency --processes 4 --threads 8 --seconds 10 --write-ratio 0.5
+    python -m benchmarks.sqlite_concurrency --modes tuned --output sqlite.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+
+MODES = {
+    "default": {"SQLITE_PERFORMANCE": "false"},
+    "tuned": {"SQLITE_PERFORMANCE": "true"},
+}
+
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def classify(error: Exception) -> str:
+    message = str(error).lower()
+    if "database is locked" in message or "database table is locked" in message:
+        return "database_locked"
+    if "queuepool limit" in message or "timed out" in message:
+        return "pool_timeout"
+    return type(error).__name__
+
+
+def prepare_database(database_url: str, mode_env: dict):
+    """Create the schema and an owner row in a fresh process with the mode's settings."""
+    os.environ.update(mode_env, DATABASE_URL=database_url)
+    from sqlalchemy import insert
+
+    from app import migrations
+    from app.database import engine
+    from app.models import Users
+
+    migrations.bootstrap(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Users).values(username="bench-owner", hashed_password="x"))
+
+
+def worker(database_url: str, mode_env: dict, threads: int, seconds: float, write_ratio: float, results):
+    os.environ.update(mode_env, DATABASE_URL=database_url)
+    # Waiting for the write lock shows up as slow BEGINs; the report covers it
+    logging.getLogger("service_common.query_log").setLevel(logging.ERROR)
+    from sqlalchemy import func, select
+
+    from app.database import SessionLocal, get_read_db
+    from app.models import Blog, Users
+    from app.timeutils import utcnow
+
+    latencies = {"write": [], "read": []}
+    errors = Counter()
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def write():
+        db = SessionLocal()
+        try:
+            owner_id = db.execute(select(Users.id).where(Users.username == "bench-owner")).scalar_one()
+            count = db.execute(select(func.count(Blog.id)).where(Blog.owner_id == owner_id)).scalar_one()
+            suffix = uuid.uuid4().hex[:12]
+            db.add(Blog(
+                title=f"Post {count} {suffix}",
+                content="benchmark " * 20,
+                excerpt="benchmark",
+                slug=f"post-{suffix}",
+                published=True,
+                created_at=utcnow(),
+                owner_id=owner_id,
+            ))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def read():
+        sessions = get_read_db()
+        db = next(sessions)
+        try:
+            db.execute(
+                select(Blog.id, Blog.title).where(Blog.published.is_(True))
+                .order_by(Blog.created_at.desc(), Blog.id.desc()).limit(20)
+            ).all()
+        finally:
+            sessions.close()
+
+    def loop(seed: int):
+        rng = random.Random(seed)
+        while time.monotonic() < deadline:
+            kind = "write" if rng.random() < write_ratio else "read"
+            started = time.perf_counter()
+            try:
+                (write if kind == "write" else read)()
+            except Exception as error:
+                with lock:
+                    errors[f"{kind}:{classify(error)}"] += 1
+                continue
+            with lock:
+                latencies[kind].append(time.perf_counter() - started)
+
+    pool = [threading.Thread(target=loop, args=(os.getpid() * 1000 + index,)) for index in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    results.put({"latencies": latencies, "errors": dict(errors)})
+
+
+def run_mode(mode: str, args) -> dict:
+    directory = tempfile.mkdtemp(prefix=f"sqlite-bench-{mode}-")
+    database_url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    context = multiprocessing.get_context("spawn")
+
+    setup = context.Process(target=prepare_database, args=(database_url, MODES[mode]))
+    setup.start()
+    setup.join()
+
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=worker,
+            args=(database_url, MODES[mode], args.threads, args.seconds, args.write_ratio, results),
+        )
+        for _ in range(args.processes)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = {"write": [], "read": []}
+    errors = Counter()
+    for result in collected:
+        for kind, values in result["latencies"].items():
+            latencies[kind].extend(values)
+        errors.update(result["errors"])
+
+    report = {"mode": mode, "database_url": database_url, "elapsed_seconds": elapsed, "errors": dict(errors)}
+    for kind, values in latencies.items():
+        report[kind] = {
+            "ok": len(values),
+            "per_second": len(values) / args.seconds,
+            "p50_ms": percentile(values, 0.50) * 1000,
+            "p95_ms": percentile(values, 0.95) * 1000,
+            "p99_ms": percentile(values, 0.99) * 1000,
+            "mean_ms": statistics.fmean(values) * 1000 if values else 0.0,
+        }
+    report["database_locked"] = sum(count for key, count in errors.items() if key.endswith("database_locked"))
+    return report
+
+
+def print_report(reports: list):
+    print(f"{'mode':<8} {'kind':<6} {'ok':>7} {'ops/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for report in reports:
+        for kind in ("write", "read"):
+            stats = report[kind]
+            print(
+                f"{report['mode']:<8} {kind:<6} {stats['ok']:>7} {stats['per_second']:>9.1f} "
+                f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}"
+            )
+        print(f"{report['mode']:<8} errors {report['errors'] or '-'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=["default", "tuned"])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4, help="threads per process")
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration of each mode")
+    parser.add_argument("--write-ratio", type=float, default=0.3)
+    parser.add_argument("--output", help="also write the reports as JSON to this file")
+    args = parser.parse_args()
+
+    reports = [run_mode(mode, args) for mode in args.modes]
+    print_report(reports)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "reports": reports}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Shared fixtures for the rest-apis-fastapi tests.
+
+The app reads its settings from the environment at import time, so they are
+pinned here, before any ``app`` module is imported: a throwaway SQLite file,
+no replicas, the plain (untuned, sync) database path.
+"""
+import os
+import tempfile
+import uuid
+
+import pytest
+
+TEST_DIR = tempfile.mkdtemp(prefix="rest-api-tests-")
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{TEST_DIR}/test.db",
+    "DATABASE_REPLICA_URLS": "",
+    "SQLITE_PERFORMANCE": "false",
+    "USE_ASYNC_DB": "false",
+    "SECRET_KEY": "test-secret",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "REFRESH_TOKEN_EXPIRE_MINUTES": "600",
+})
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+
+    # The context manager runs the lifespan, which creates the schema
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client):
+    username = f"user-{uuid.uuid4().hex[:8]}"
+    client.post("/auth/", json={"username": username, "password": "password"})
+    token = client.post("/auth/token", data={"username": username, "password": "password"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def create_blog(client, headers, **fields) -> dict:
+    payload = {"title": f"Post {uuid.uuid4().hex[:8]}", "content": "Some content", "published": True, **fields}
+    response = client.post("/blogs/", json=payload, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
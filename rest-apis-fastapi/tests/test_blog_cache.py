@@ -0,0 +1,110 @@
+from app.blog_cache import OWNER_VARIANT, BlogCache
+
+from conftest import create_blog
+
+
+def write_from_another_worker(blog_id: int):
+    """Delete a blog the way another worker would: this process's caches are not told."""
+    from app import crud
+    from app.database import SessionLocal
+    from app.models import Blog
+
+    with SessionLocal() as db:
+        db.query(Blog).filter(Blog.id == blog_id).delete()
+        db.execute(crud.bump_version_statement(db.get_bind().dialect.name, crud.BLOGS_SCOPE))
+        db.commit()
+    # The version cache refreshes within HTTP_CACHE_VERSION_TTL; the body cache keeps its entry
+    crud.blog_versions.invalidate(crud.BLOGS_SCOPE)
+
+
+def test_put_then_get_hits():
+    cache = BlogCache(maxsize=10, ttl=60)
+    cache.put(1, b"body", cache.generation())
+
+    assert cache.get(1) == b"body"
+    assert cache.stats()["hits"] == 1
+
+
+def test_load_that_raced_an_invalidation_is_not_stored():
+    cache = BlogCache(maxsize=10, ttl=60)
+    generation = cache.generation()
+    # A write lands while the read is still loading the old row
+    cache.invalidate(1)
+    cache.put(1, b"stale", generation)
+
+    assert cache.get(1) is None
+
+
+def test_invalidate_drops_every_variant():
+    cache = BlogCache(maxsize=10, ttl=60)
+    cache.put(1, b"plain", cache.generation())
+    cache.put(1, b"with owner", cache.generation(), OWNER_VARIANT)
+
+    cache.invalidate(1)
+
+    assert cache.get(1) is None
+    assert cache.get(1, OWNER_VARIANT) is None
+
+
+def test_variants_are_cached_separately():
+    cache = BlogCache(maxsize=10, ttl=60)
+    cache.put(1, b"plain", cache.generation())
+
+    assert cache.get(1, OWNER_VARIANT) is None
+    assert cache.get(1) == b"plain"
+
+
+def test_least_recently_used_blog_is_evicted():
+    cache = BlogCache(maxsize=2, ttl=60)
+    for blog_id in (1, 2):
+        cache.put(blog_id, b"body", cache.generation())
+    cache.get(1)
+    cache.put(3, b"body", cache.generation())
+
+    assert cache.get(2) is None
+    assert cache.get(1) == b"body"
+    assert cache.get(3) == b"body"
+
+
+def test_expired_entries_miss():
+    cache = BlogCache(maxsize=10, ttl=0)
+    cache.put(1, b"body", cache.generation())
+
+    assert cache.get(1) is None
+
+
+def test_entries_loaded_before_the_requested_version_miss():
+    cache = BlogCache(maxsize=10, ttl=60)
+    cache.put(1, b"body", cache.generation(), version=3)
+
+    assert cache.get(1, version=4) is None
+    cache.put(1, b"body", cache.generation(), version=4)
+    assert cache.get(1, version=3) == b"body"
+    assert cache.get(1, version=4) == b"body"
+
+
+def test_zero_size_disables_the_cache():
+    cache = BlogCache(maxsize=0, ttl=60)
+    cache.put(1, b"body", cache.generation())
+
+    assert cache.get(1) is None
+
+
+def test_route_write_invalidates_the_cached_body(client, auth_headers):
+    blog = create_blog(client, auth_headers)
+    assert client.get(f"/blogs/{blog['id']}").json()["published"] is True
+
+    client.post("/blogs/bulk/publish", json={"ids": [blog["id"]], "published": False}, headers=auth_headers)
+
+    assert client.get(f"/blogs/{blog['id']}").json()["published"] is False
+
+
+def test_write_from_another_worker_is_not_served_under_the_new_etag(client, auth_headers):
+    blog = create_blog(client, auth_headers)
+    first = client.get(f"/blogs/{blog['id']}")
+    assert first.status_code == 200
+
+    write_from_another_worker(blog["id"])
+
+    assert client.get(f"/blogs/{blog['id']}").status_code == 404
+    assert client.get(f"/blogs/{blog['id']}", headers={"If-None-Match": first.headers["ETag"]}).status_code == 404
@@ -0,0 +1,118 @@
+"""ConnectionPool and connection hand-back, against fake connections (no PostgreSQL needed)."""
+import threading
+import time
+
+import pytest
+from psycopg2 import extensions
+
+from app import database_psycopg
+from app.database_psycopg import ConnectionPool, PoolTimeout, RequestReadConnection
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.rollbacks = 0
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture(autouse=True)
+def fake_connections(monkeypatch):
+    created = []
+
+    def create_connection(dsn=None):
+        created.append(FakeConnection())
+        return created[-1]
+
+    monkeypatch.setattr(database_psycopg, "create_connection", create_connection)
+    monkeypatch.setattr(database_psycopg, "_pool", None)
+    monkeypatch.setattr(database_psycopg, "_replicas", None)
+    return created
+
+
+def make_pool(**options) -> ConnectionPool:
+    settings = {"min_size": 0, "max_size": 1, "timeout": 0.05, "ping_after": 60, "leak_threshold": 60}
+    return ConnectionPool(**{**settings, **options})
+
+
+def test_checkout_times_out_when_the_pool_is_exhausted():
+    pool = make_pool()
+    pool.getconn()
+
+    started = time.monotonic()
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+
+    assert time.monotonic() - started >= 0.05
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_returned_connection_is_reused():
+    pool = make_pool()
+    conn = pool.getconn()
+    pool.putconn(conn)
+
+    assert pool.getconn() is conn
+    assert pool.stats()["size"] == 1
+
+
+def test_putconn_rolls_back_an_open_transaction():
+    pool = make_pool()
+    conn = pool.getconn()
+    conn.status = extensions.TRANSACTION_STATUS_INTRANS
+
+    pool.putconn(conn)
+
+    assert conn.rollbacks == 1
+
+
+def test_waiting_checkout_gets_the_released_connection():
+    pool = make_pool(timeout=5)
+    conn = pool.getconn()
+    threading.Timer(0.05, pool.putconn, args=(conn,)).start()
+
+    assert pool.getconn() is conn
+
+
+def test_closed_connection_is_replaced(fake_connections):
+    pool = make_pool()
+    conn = pool.getconn()
+    conn.closed = 1
+    pool.putconn(conn)
+
+    assert pool.getconn() is not conn
+    assert len(fake_connections) == 2
+
+
+def test_release_after_close_pool_closes_the_connection():
+    conn = database_psycopg.get_connection()
+    database_psycopg.close_pool()
+
+    database_psycopg.release_connection(conn)
+
+    assert conn.closed
+    # Shutdown must not leave a fresh pool behind
+    assert database_psycopg._pool is None
+
+
+def test_request_read_connection_borrows_lazily_and_once(fake_connections):
+    read = RequestReadConnection()
+    assert fake_connections == []
+
+    conn = read.get()
+    assert read.get() is conn
+    assert not read.may_lag()
+
+    read.release()
+    read.release()
+    assert database_psycopg.get_pool().stats()["in_use"] == 0
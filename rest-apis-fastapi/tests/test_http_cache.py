@@ -0,0 +1,58 @@
+from app.http_cache import _etag_matches
+
+from conftest import create_blog
+
+
+def test_revalidation_with_current_etag_returns_304(client, auth_headers):
+    blog = create_blog(client, auth_headers)
+    first = client.get(f"/blogs/{blog['id']}")
+    etag = first.headers["ETag"]
+
+    revalidated = client.get(f"/blogs/{blog['id']}", headers={"If-None-Match": etag})
+
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == etag
+
+
+def test_write_changes_the_etag(client, auth_headers):
+    blog = create_blog(client, auth_headers)
+    etag = client.get(f"/blogs/{blog['id']}").headers["ETag"]
+
+    client.post("/blogs/bulk/publish", json={"ids": [blog["id"]], "published": True}, headers=auth_headers)
+    response = client.get(f"/blogs/{blog['id']}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_listing_revalidates_per_query(client, auth_headers):
+    create_blog(client, auth_headers)
+    etag = client.get("/blogs/", params={"limit": 5}).headers["ETag"]
+
+    assert client.get("/blogs/", params={"limit": 5}, headers={"If-None-Match": etag}).status_code == 304
+    # Another query string is another representation
+    assert client.get("/blogs/", params={"limit": 6}, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_wildcard_does_not_turn_missing_blog_into_304(client):
+    response = client.get("/blogs/999999999", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 404
+
+
+def test_wildcard_on_existing_blog_returns_the_body(client, auth_headers):
+    blog = create_blog(client, auth_headers)
+
+    response = client.get(f"/blogs/{blog['id']}", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 200
+    assert response.json()["id"] == blog["id"]
+
+
+def test_etag_matching_is_weak_and_list_aware():
+    assert _etag_matches('"1-abc"', '"1-abc"')
+    assert _etag_matches('W/"1-abc"', '"1-abc"')
+    assert _etag_matches('"0-old", "1-abc"', '"1-abc"')
+    assert not _etag_matches('"1-abd"', '"1-abc"')
+    assert not _etag_matches("*", '"1-abc"')
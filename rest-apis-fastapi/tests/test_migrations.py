@@ -0,0 +1,54 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app import migrations
+from app.text_utils import make_excerpt
+
+LEGACY_SCHEMA = (
+    "CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR, hashed_password VARCHAR)",
+    "CREATE TABLE blogs (id INTEGER PRIMARY KEY, title VARCHAR, content VARCHAR, slug VARCHAR, "
+    "published BOOLEAN, created_at VARCHAR, owner_id INTEGER)",
+)
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    for statement in LEGACY_SCHEMA:
+        conn.execute(statement)
+    conn.execute(
+        "INSERT INTO blogs (title, content, slug, published, created_at) "
+        "VALUES ('Hello', '  A first\n\npost  with   odd spacing', 'hello', 1, '2024-01-01T10:00:00')"
+    )
+    conn.commit()
+    conn.close()
+    engine = create_engine(f"sqlite:///{path}")
+    yield engine
+    engine.dispose()
+
+
+def test_legacy_database_is_upgraded_once(legacy_engine):
+    assert migrations.run_migrations(legacy_engine) is True
+    assert migrations.run_migrations(legacy_engine) is False
+
+    with legacy_engine.connect() as conn:
+        excerpt, created_at = conn.execute(text("SELECT excerpt, created_at FROM blogs")).one()
+        matches = conn.execute(text("SELECT rowid FROM blogs_fts WHERE blogs_fts MATCH 'spacing'")).all()
+    assert excerpt == make_excerpt("  A first\n\npost  with   odd spacing")
+    assert created_at == "2024-01-01 10:00:00"
+    assert matches == [(1,)]
+
+
+def test_force_reruns_the_idempotent_steps(legacy_engine):
+    migrations.run_migrations(legacy_engine)
+
+    assert migrations.run_migrations(legacy_engine, force=True) is True
+
+
+def test_bootstrap_skips_a_current_schema(legacy_engine):
+    migrations.run_migrations(legacy_engine)
+
+    assert migrations.bootstrap(legacy_engine) is False
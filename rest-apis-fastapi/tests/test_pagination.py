@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+
+from conftest import create_blog
+
+
+def test_cursor_round_trips():
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(datetime(2024, 1, 1), 1)[:-3]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_malformed_cursor_is_a_400(client):
+    assert client.get("/blogs/", params={"cursor": "garbage"}).status_code == 400
+
+
+def walk(client, path, headers=None, **params):
+    """Follow X-Next-Cursor from the first page to the last; returns every row."""
+    rows, cursor = [], None
+    while True:
+        response = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200, response.text
+        rows.extend(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return rows
+
+
+def test_pages_cover_ties_without_gaps_or_repeats(client, auth_headers):
+    # A bulk insert gives every row the same created_at, so only the id breaks ties
+    response = client.post(
+        "/blogs/bulk",
+        json={"blogs": [{"title": f"Tied {index}", "content": "x", "published": True} for index in range(7)]},
+        headers=auth_headers,
+    )
+    created = [item["id"] for item in response.json()["results"]]
+
+    ids = [row["id"] for row in walk(client, "/blogs/", limit=2)]
+
+    assert len(ids) == len(set(ids))
+    assert [blog_id for blog_id in ids if blog_id in created] == sorted(created, reverse=True)
+
+
+def test_my_blogs_walk_includes_drafts(client, auth_headers):
+    draft = create_blog(client, auth_headers, published=False)
+    published = create_blog(client, auth_headers)
+
+    ids = [row["id"] for row in walk(client, "/blogs/mine", headers=auth_headers, limit=1)]
+
+    assert len(ids) == len(set(ids))
+    assert ids.index(published["id"]) < ids.index(draft["id"])
+    assert draft["id"] not in [row["id"] for row in walk(client, "/blogs/", limit=50)]
@@ -0,0 +1,19 @@
+import pytest
+
+from conftest import create_blog
+
+
+@pytest.mark.parametrize("q", ["", " ", "\t  "])
+def test_blank_query_is_rejected(client, q):
+    # FTS5 raises a syntax error on an empty MATCH; the route must answer 422, not 500
+    assert client.get("/blogs/search", params={"q": q}).status_code == 422
+
+
+def test_search_finds_published_posts_only(client, auth_headers):
+    published = create_blog(client, auth_headers, content="an aardvark walks into a bar")
+    draft = create_blog(client, auth_headers, content="another aardvark, unpublished", published=False)
+
+    ids = [row["id"] for row in client.get("/blogs/search", params={"q": "aardvark"}).json()]
+
+    assert published["id"] in ids
+    assert draft["id"] not in ids
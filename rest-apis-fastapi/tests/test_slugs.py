@@ -0,0 +1,37 @@
+import uuid
+
+from sqlalchemy import event
+
+from app.slugs import next_slugs
+
+
+def test_next_slugs_continues_each_base_and_spreads_repeats():
+    taken = ["post-7", "other-2"]
+
+    assert next_slugs(["post", "other", "post", "fresh"], taken) == ["post-8", "other-3", "post-9", "fresh-2"]
+
+
+def test_bulk_insert_retries_taken_slugs_as_one_batch(client, auth_headers):
+    from app.database import engine
+
+    titles = [f"Taken {uuid.uuid4().hex[:8]}" for _ in range(3)]
+    blogs = [{"title": title, "content": "x", "published": True} for title in titles]
+    client.post("/blogs/bulk", json={"blogs": blogs}, headers=auth_headers)
+
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(" ".join(statement.split()).upper())
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = client.post("/blogs/bulk", json={"blogs": blogs}, headers=auth_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == ["created"] * 3
+    assert [result["slug"] for result in results] == [f"{blog['title'].lower().replace(' ', '-')}-2" for blog in blogs]
+    # The first insert, one lookup for every taken slug, one retry insert
+    assert sum(statement.startswith("INSERT INTO BLOGS ") for statement in statements) == 2
+    assert sum(" LIKE " in statement for statement in statements) == 1
@@ -0,0 +1,112 @@
+"""
+SQLITE_PERFORMANCE=true under concurrent reads, writes and logins.
+
+The profile is picked at import time, so each mode runs in its own
+interpreter. A short DB_POOL_TIMEOUT turns a checkout deadlock into failed
+requests instead of a hung test run.
+"""
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from conftest import TEST_DIR
+
+SERVICE_DIR = Path(__file__).resolve().parents[1]
+
+CONCURRENT_REQUESTS = textwrap.dedent("""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        client.post("/auth/", json={"username": "writer", "password": "password"})
+        token = client.post("/auth/token", data={"username": "writer", "password": "password"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        blog_id = client.post("/blogs/", json={"title": "First", "content": "x", "published": True}, headers=headers).json()["id"]
+
+        def request(index):
+            if index % 2:
+                return client.post("/blogs/", json={"title": f"Post {index}", "content": "y", "published": True}, headers=headers).status_code
+            return client.get(f"/blogs/{blog_id}" if index % 4 else "/blogs/").status_code
+
+        # More requests in flight than the thread pool has workers
+        with ThreadPoolExecutor(64) as executor:
+            statuses = list(executor.map(request, range(120)))
+
+    failed = [status for status in statuses if status not in (200, 201)]
+    print(f"{len(failed)} failed: {failed[:5]}")
+    raise SystemExit(1 if failed else 0)
+""")
+
+
+WRITE_DURING_LOGIN = textwrap.dedent("""
+    import os
+    import sqlite3
+
+    from fastapi.testclient import TestClient
+
+    from app import utils
+    from app.main import app
+    from app.routers import auth_async
+
+    writes = []
+
+    async def verify_while_writing(password, hashed_password):
+        # Another connection writes while the login is still checking the hash
+        conn = sqlite3.connect(os.environ["DATABASE_URL"].removeprefix("sqlite:///"), timeout=0.5, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("UPDATE users SET username = username")
+            conn.execute("COMMIT")
+            writes.append("committed")
+        except sqlite3.OperationalError as error:
+            writes.append(str(error))
+        finally:
+            conn.close()
+        return True
+
+    utils.verify_password = auth_async.verify_password = verify_while_writing
+
+    with TestClient(app) as client:
+        client.post("/auth/", json={"username": "reader", "password": "password"})
+        status = client.post("/auth/token", data={"username": "reader", "password": "password"}).status_code
+
+    print(status, writes)
+    raise SystemExit(0 if status == 200 and writes == ["committed"] else 1)
+""")
+
+
+def run_tuned(script: str, name: str, use_async_db: str) -> subprocess.CompletedProcess:
+    database = Path(TEST_DIR) / f"{name}-{use_async_db}.db"
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database}",
+        "SQLITE_PERFORMANCE": "true",
+        "USE_ASYNC_DB": use_async_db,
+        "DB_POOL_TIMEOUT": "5",
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(SERVICE_DIR), os.environ.get("PYTHONPATH")])),
+    }
+    return subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=SERVICE_DIR, env=env, capture_output=True, text=True, timeout=120,
+    )
+
+
+@pytest.mark.parametrize("use_async_db", ["false", "true"])
+def test_concurrent_reads_and_writes_do_not_deadlock(use_async_db):
+    result = run_tuned(CONCURRENT_REQUESTS, "tuned", use_async_db)
+
+    assert result.returncode == 0, result.stdout + result.stderr[-2000:]
+
+
+@pytest.mark.parametrize("use_async_db", ["false", "true"])
+def test_login_does_not_hold_the_write_lock_while_hashing(use_async_db):
+    result = run_tuned(WRITE_DURING_LOGIN, "login", use_async_db)
+
+    assert result.returncode == 0, result.stdout + result.stderr[-2000:]
@@ -0,0 +1,5 @@
+"""
+Modules shared by the FastAPI services in this repository (rest-apis-fastapi,
+jwt-auth and the okta-vite-fastapi backend). Installed with the root project
+(``uv sync``) or from each service's requirements.txt.
+"""
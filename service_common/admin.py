@@ -0,0 +1,34 @@
+"""
+Operational endpoints. Each app publishes its pool statistics callable on
+``app.state.pool_stats``. The routes answer 404 until ADMIN_TOKEN is set,
+and then require it in the X-Admin-Token header.
+"""
+import hmac
+import os
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def require_admin(x_admin_token: Annotated[Optional[str], Header()] = None):
+    # Fail closed: without a configured token the admin routes do not exist
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    # Bytes, since compare_digest() rejects str with non-ASCII characters
+    if not hmac.compare_digest((x_admin_token or "").encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required")
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+)
+
+
+@router.get("/db-pool", status_code=status.HTTP_200_OK)
+async def db_pool_stats(request: Request):
+    """Checked-out, overflow and checkout-wait figures of every connection pool."""
+    return request.app.state.pool_stats()
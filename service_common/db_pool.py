@@ -0,0 +1,176 @@
+"""
+Connection-pool sizing and live pool statistics for SQLAlchemy engines.
+
+Pool settings come from the environment through pydantic-settings:
+
+    DB_POOL_SIZE        connections kept open per engine (default 5)
+    DB_MAX_OVERFLOW     extra connections allowed under load (default 10)
+    DB_POOL_TIMEOUT     seconds a checkout waits before failing (default 30)
+    DB_POOL_PRE_PING    test connections with a ping on checkout (default false)
+    DB_POOL_RECYCLE     reconnect connections older than this many seconds (default -1, never)
+
+Engines built with ``engine_options`` use a pool that times every checkout,
+so ``pool_stats()`` can report checked-out and overflow connections next to
+how long requests waited for one. Set ``pool_monitor.observe`` to feed
+checkout waits into a metrics histogram.
+"""
+import threading
+import time
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="DB_", extra="ignore")
+
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_pre_ping: bool = False
+    pool_recycle: int = -1
+
+
+pool_settings = PoolSettings()
+
+# Exported per pool by pool_stats() and the metrics endpoint
+POOL_METRIC_FIELDS = {
+    "size": "Connections the pool keeps open.",
+    "checked_out": "Connections currently lent out.",
+    "overflow": "Connections open beyond pool_size (negative while the pool is still filling).",
+    "waiting_checkouts": "Checkouts currently waiting for a connection.",
+    "checkout_timeouts": "Checkouts that gave up after pool_timeout.",
+    "wait_seconds_max": "Longest wait for a connection.",
+}
+
+
+class PoolMonitor:
+    """Checkout wait statistics per named pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engines = {}  # name -> engine
+        self._waits = {}  # name -> [checkouts, waiting, timeouts, wait_total, wait_max]
+        # Optional callback receiving the seconds each checkout waited
+        self.observe = None
+
+    def register(self, name: str, engine):
+        engine = getattr(engine, "sync_engine", engine)
+        with self._lock:
+            self._engines[name] = engine
+            self._waits.setdefault(name, [0, 0, 0, 0.0, 0.0])
+        engine.pool.stats_name = name
+
+    def _start(self, name: str):
+        with self._lock:
+            self._waits[name][1] += 1
+
+    def _finish(self, name: str, elapsed: float, timed_out: bool):
+        with self._lock:
+            waits = self._waits[name]
+            waits[0] += int(not timed_out)
+            waits[1] -= 1
+            waits[2] += int(timed_out)
+            waits[3] += elapsed
+            waits[4] = max(waits[4], elapsed)
+        if self.observe is not None:
+            self.observe(elapsed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            engines = dict(self._engines)
+            waits = {name: list(values) for name, values in self._waits.items()}
+        report = {}
+        for name, engine in engines.items():
+            pool = engine.pool
+            checkouts, waiting, timeouts, wait_total, wait_max = waits[name]
+            entry = {"pool": type(pool).__name__}
+            if isinstance(pool, QueuePool):
+                entry.update(
+                    size=pool.size(),
+                    max_overflow=pool._max_overflow,
+                    checked_out=pool.checkedout(),
+                    checked_in=pool.checkedin(),
+                    overflow=pool.overflow(),
+                )
+            entry.update(
+                checkouts=checkouts,
+                waiting_checkouts=waiting,
+                checkout_timeouts=timeouts,
+                wait_seconds_total=wait_total,
+                wait_seconds_max=wait_max,
+                wait_seconds_avg=wait_total / checkouts if checkouts else 0.0,
+            )
+            report[name] = entry
+        return report
+
+
+pool_monitor = PoolMonitor()
+
+
+class TimedPoolMixin:
+    """Times ``_do_get``, the blocking part of a checkout."""
+
+    stats_name = None
+
+    def _do_get(self):
+        if self.stats_name is None:
+            return super()._do_get()
+        pool_monitor._start(self.stats_name)
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            pool_monitor._finish(self.stats_name, time.perf_counter() - started, timed_out)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting under the same name
+        pool = super().recreate()
+        pool.stats_name = self.stats_name
+        return pool
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def is_file_database(url: str) -> bool:
+    """True for SQLite URLs backed by a file (not ``:memory:``)."""
+    if not url.startswith("sqlite"):
+        return False
+    path = url.split("://", 1)[1].lstrip("/").split("?", 1)[0]
+    return bool(path) and path != ":memory:" and "mode=memory" not in url
+
+
+def uses_queue_pool(url: str) -> bool:
+    # In-memory SQLite gets one connection per thread (SingletonThreadPool / StaticPool)
+    return not url.startswith("sqlite") or is_file_database(url)
+
+
+def engine_options(url: str, is_async: bool = False, **overrides) -> dict:
+    """Keyword arguments for create_engine / create_async_engine from the pool settings."""
+    if not uses_queue_pool(url):
+        return overrides
+    options = {
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_size": pool_settings.pool_size,
+        "max_overflow": pool_settings.max_overflow,
+        "pool_timeout": pool_settings.pool_timeout,
+        "pool_pre_ping": pool_settings.pool_pre_ping,
+        "pool_recycle": pool_settings.pool_recycle,
+    }
+    options.update(overrides)
+    return options
+
+
+def pool_stats() -> dict:
+    return pool_monitor.stats()
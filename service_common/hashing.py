@@ -0,0 +1,110 @@
+"""
+Password hashing off the event loop.
+
+bcrypt is deliberately slow, so calling it directly from an ``async def``
+route stalls every other request on the worker. The helpers here run it on a
+small dedicated thread pool (bcrypt releases the GIL) and keep track of how
+long callers wait for a free slot.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# Maximum number of hashes computed at the same time
+HASH_MAX_WORKERS = int(os.getenv("HASH_MAX_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+class HashingExecutor:
+    """Bounded thread pool for CPU-heavy password hashing with basic metrics."""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        # Optional callback receiving the seconds each hash took (e.g. a metrics histogram)
+        self.observe = None
+        self._executor = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="hashing"
+                )
+            return self._executor
+
+    def _call(self, fn, args, submitted_at: float):
+        wait = time.perf_counter() - submitted_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            if self.observe is not None:
+                self.observe(time.perf_counter() - started)
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def _on_done(self, future):
+        # A job cancelled before it started never reaches _call
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    async def run(self, fn, *args):
+        """Run ``fn(*args)`` on the pool and await its result."""
+        executor = self._get_executor()
+        with self._lock:
+            self._queued += 1
+        future = executor.submit(self._call, fn, args, time.perf_counter())
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self._queued,
+                "in_flight": self._running,
+                "completed": self._completed,
+                "wait_seconds_total": self._wait_total,
+                "wait_seconds_max": self._wait_max,
+                "wait_seconds_avg": self._wait_total / self._completed if self._completed else 0.0,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+hashing_executor = HashingExecutor(HASH_MAX_WORKERS)
+
+
+async def hash_password(password: str) -> str:
+    return await hashing_executor.run(bcrypt_context.hash, password)
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await hashing_executor.run(bcrypt_context.verify, password, hashed_password)
+
+
+def hashing_stats() -> dict:
+    return hashing_executor.stats()
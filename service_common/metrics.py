@@ -0,0 +1,245 @@
+"""
+Request and resource metrics in Prometheus text format.
+
+``MetricsMiddleware`` records a latency histogram per (method, route template,
+status) and a gauge of requests in flight; ``timed()`` / ``observe_section()``
+record time spent in bcrypt, JWT verification and database calls. Everything
+is kept in plain in-process counters (one lock-protected bisect per
+observation), cheap enough to leave on in production. ``install_metrics(app)``
+adds the middleware and serves the text exposition at ``/metrics``.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import partial
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds (seconds) of the histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SECTION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Route label for requests that matched no route, so 404 scans cannot blow up cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Cumulative histogram with one series per label combination."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple, buckets: tuple):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series = {}  # label values -> [bucket counts (last is +Inf), sum, count]
+
+    def observe(self, labels: tuple, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list:
+        with self._lock:
+            snapshot = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items()]
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, counts, total, count in sorted(snapshot):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _labels(self.labelnames, labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class Gauge:
+    """Value that goes up and down, one per label combination."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def add(self, labels: tuple, amount: float):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            snapshot = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        lines.extend(f"{self.name}{_labels(self.labelnames, labels)} {value}" for labels, value in snapshot)
+        return lines
+
+
+class CallbackGauge:
+    """Gauge whose values are read from ``collect()`` (label values -> value) at scrape time."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple, collect):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.collect = collect
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        lines.extend(
+            f"{self.name}{_labels(self.labelnames, labels)} {value}"
+            for labels, value in sorted(self.collect().items())
+        )
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served.", ("method",))
+SECTION_TIME = Histogram(
+    "app_section_duration_seconds",
+    "Time spent in bcrypt, JWT verification and database calls.",
+    ("section",),
+    SECTION_BUCKETS,
+)
+
+METRICS = [REQUEST_LATENCY, IN_FLIGHT, SECTION_TIME]
+
+
+def observe_section(section: str, seconds: float):
+    SECTION_TIME.observe((section,), seconds)
+
+
+@contextmanager
+def timed(section: str):
+    """Record the time spent in the ``with`` block under ``section``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_section(section, time.perf_counter() - started)
+
+
+def register_stats(prefix: str, label: str, stats, fields: dict):
+    """
+    Export a ``stats()`` callable returning {name: {field: value}} (pool
+    statistics and the like) as one gauge per field, labelled by name.
+    """
+    def collect(field):
+        return {(name,): entry[field] for name, entry in stats().items() if field in entry}
+
+    for field, documentation in fields.items():
+        gauge = CallbackGauge(f"{prefix}_{field}", documentation, (label,), partial(collect, field))
+        # Re-registering (another create_app() call) replaces the earlier gauge
+        METRICS[:] = [metric for metric in METRICS if metric.name != gauge.name]
+        METRICS.append(gauge)
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    # Older Starlette only records the endpoint in the scope
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is not None and app is not None:
+        for candidate in getattr(app, "routes", ()):
+            if getattr(candidate, "endpoint", None) is endpoint:
+                return candidate.path
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing every HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_FLIGHT.add((method,), 1)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            IN_FLIGHT.add((method,), -1)
+            REQUEST_LATENCY.observe(
+                (method, _route_template(scope), str(status_code)),
+                time.perf_counter() - started,
+            )
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    return Response(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def install_metrics(app):
+    """Time every request of ``app`` and serve the metrics at /metrics."""
+    app.add_middleware(MetricsMiddleware)
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
+
+def instrument_sqlalchemy():
+    """Record the duration of every SQLAlchemy cursor execution under ``db``."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_started", None)
+    if started is not None:
+        observe_section("db", time.perf_counter() - started)
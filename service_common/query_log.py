@@ -0,0 +1,149 @@
+"""
+Per-request SQL statistics and slow-query logging.
+
+Every statement run through an instrumented SQLAlchemy engine
+(``instrument_engine``) or a psycopg cursor that calls ``record_query`` is
+counted against the request being served: ``QueryLogMiddleware`` opens a
+``RequestQueries`` tally for each HTTP request in a context variable, which
+the thread pool and the async drivers carry along with the request.
+
+Statements slower than DB_SLOW_QUERY_MS are logged as warnings. With
+DB_QUERY_DEBUG=true each response also carries its query count and DB time,
+and statements repeated DB_N_PLUS_ONE_THRESHOLD times or more within one
+request (the N+1 pattern) are logged and listed in a response header.
+
+SQLAlchemy is only imported by ``instrument_engine``; psycopg code needs just
+``record_query``.
+"""
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+DB_QUERY_DEBUG = os.getenv("DB_QUERY_DEBUG", "false").lower() in ("1", "true", "yes")
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "3"))
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+N_PLUS_ONE_HEADER = "X-DB-N-Plus-One"
+
+# Statements are truncated to this many characters in logs and headers
+STATEMENT_PREVIEW = 200
+
+
+class RequestQueries:
+    """Statements issued while serving one request."""
+
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def add(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int = DB_N_PLUS_ONE_THRESHOLD) -> list:
+        """(statement, times) for statements run at least ``threshold`` times."""
+        return [(statement, times) for statement, times in self.statements.most_common() if times >= threshold]
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def current_queries() -> Optional[RequestQueries]:
+    return _current.get()
+
+
+def _preview(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > STATEMENT_PREVIEW:
+        return statement[:STATEMENT_PREVIEW] + "..."
+    return statement
+
+
+def record_query(statement, seconds: float):
+    """Count ``statement`` against the current request and log it when slow."""
+    if isinstance(statement, bytes):
+        statement = statement.decode(errors="replace")
+    else:
+        statement = str(statement)
+    queries = _current.get()
+    if queries is not None:
+        queries.add(statement, seconds)
+    if seconds * 1000 >= DB_SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms): %s", seconds * 1000, _preview(statement))
+
+
+class QueryLogMiddleware:
+    """Pure ASGI middleware that tallies the statements of each HTTP request."""
+
+    def __init__(self, app, debug: bool = DB_QUERY_DEBUG):
+        self.app = app
+        self.debug = debug
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        token = _current.set(queries)
+
+        async def send_with_stats(message):
+            # Streaming bodies may still run queries after this point; the
+            # headers report what was issued before the response started
+            if message["type"] == "http.response.start" and self.debug:
+                headers = list(message.get("headers", []))
+                headers.append((QUERY_COUNT_HEADER.lower().encode(), str(queries.count).encode()))
+                headers.append((QUERY_TIME_HEADER.lower().encode(), f"{queries.seconds * 1000:.2f}".encode()))
+                repeated = queries.repeated()
+                if repeated:
+                    summary = "; ".join(f"{times}x {_preview(statement)}" for statement, times in repeated)
+                    headers.append((N_PLUS_ONE_HEADER.lower().encode(), summary.encode("latin-1", errors="replace")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current.reset(token)
+            if self.debug:
+                for statement, times in queries.repeated():
+                    logger.warning(
+                        "Possible N+1: %s %s ran %d times: %s",
+                        scope["method"], scope["path"], times, _preview(statement)
+                    )
+                logger.debug(
+                    "%s %s issued %d queries in %.2f ms",
+                    scope["method"], scope["path"], queries.count, queries.seconds * 1000
+                )
+
+
+def instrument_engine(engine):
+    """Record every statement executed through ``engine`` (sync or async)."""
+    from sqlalchemy import event
+
+    engine = getattr(engine, "sync_engine", engine)
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is not None:
+        record_query(statement, time.perf_counter() - started)
@@ -0,0 +1,113 @@
+"""
+Checksum-gated schema bootstrap for SQLAlchemy databases.
+
+``create_all`` and the upgrade steps reflect the live schema on every boot,
+which is slow and, with many replicas starting together, contends for catalog
+locks. Instead a checksum of the declared schema (the DDL the metadata
+compiles to plus a revision number for hand-written upgrade steps) is stored
+per component in ``schema_versions``. Boot reads it back with one SELECT and
+only runs the DDL when it differs.
+
+SCHEMA_AUTO_MIGRATE=false makes startup refuse to serve a stale schema
+instead of upgrading it, for deploys that run the ``migrate`` command first.
+"""
+import hashlib
+import logging
+import os
+from typing import Callable, Optional
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, delete, func, insert, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_AUTO_MIGRATE = os.getenv("SCHEMA_AUTO_MIGRATE", "true").lower() in ("1", "true", "yes")
+
+# Kept out of the application metadata so create_all never reflects it
+schema_metadata = MetaData()
+schema_versions = Table(
+    "schema_versions",
+    schema_metadata,
+    Column("component", String(64), primary_key=True),
+    Column("checksum", String(64), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+)
+
+
+class SchemaOutOfDate(RuntimeError):
+    """Raised at startup when the stored checksum differs and auto-migration is off."""
+
+
+def metadata_checksum(metadata: MetaData, dialect, revision: int = 0) -> str:
+    """SHA-256 of the DDL ``metadata`` compiles to on ``dialect``, plus ``revision``."""
+    digest = hashlib.sha256(f"revision:{revision}\n".encode())
+    for table in metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    return digest.hexdigest()
+
+
+def stored_checksum(engine, component: str) -> Optional[str]:
+    """The checksum recorded for ``component``, or None before the first migration."""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(
+                select(schema_versions.c.checksum).where(schema_versions.c.component == component)
+            ).scalar_one_or_none()
+    except DBAPIError:
+        # schema_versions does not exist yet
+        return None
+
+
+def lock_schema(conn: Connection):
+    """
+    Serialize migrations for the rest of ``conn``'s transaction, so replicas
+    starting together wait for each other instead of racing on the DDL.
+    """
+    if conn.dialect.name == "postgresql":
+        # Same key as the psycopg backend's init_db()
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('schema_versions'))"))
+    conn.execute(CreateTable(schema_versions, if_not_exists=True))
+    if conn.dialect.name == "sqlite":
+        # Any write takes the database's RESERVED lock until the transaction ends
+        conn.execute(text("UPDATE schema_versions SET checksum = checksum WHERE 0 = 1"))
+
+
+def record_checksum(conn: Connection, component: str, checksum: str):
+    conn.execute(delete(schema_versions).where(schema_versions.c.component == component))
+    conn.execute(insert(schema_versions).values(component=component, checksum=checksum))
+
+
+def migrate(engine, component: str, checksum: str, apply: Callable[[Connection], None], force: bool = False) -> bool:
+    """
+    Run ``apply`` (idempotent DDL on the connection it is given) and record
+    ``checksum`` unless the stored checksum already matches. Both happen in
+    one transaction under lock_schema(), and the checksum is read again once
+    the lock is held. Returns True when DDL was run.
+    """
+    if not force and stored_checksum(engine, component) == checksum:
+        return False
+    with engine.begin() as conn:
+        lock_schema(conn)
+        stored = conn.execute(
+            select(schema_versions.c.checksum).where(schema_versions.c.component == component)
+        ).scalar_one_or_none()
+        if not force and stored == checksum:
+            # Another process migrated while we waited for the lock
+            return False
+        logger.info("Migrating %s schema to %s", component, checksum[:12])
+        apply(conn)
+        record_checksum(conn, component, checksum)
+    return True
+
+
+def ensure_schema(engine, component: str, checksum: str, apply: Callable[[Connection], None]) -> bool:
+    """Startup hook: migrate when allowed, otherwise fail on a stale schema."""
+    if SCHEMA_AUTO_MIGRATE:
+        return migrate(engine, component, checksum, apply)
+    if stored_checksum(engine, component) != checksum:
+        raise SchemaOutOfDate(f"{component} schema is out of date; run the migrate command")
+    return False
@@ -0,0 +1,103 @@
+"""
+Cache of verified JWT claims.
+
+The same bearer token is usually presented many times before it expires, so
+instead of running ``jwt.decode`` (signature check included) on every request
+we remember the claims of tokens that already verified, until their ``exp``.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from jose import jwt
+
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified claims keyed by a SHA-256 digest of the token."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        # Optional callback receiving the seconds each signature check took
+        self.observe = None
+        self._entries: "OrderedDict[str, tuple[dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, claims: dict):
+        exp = claims.get("exp")
+        if self.maxsize <= 0 or not isinstance(exp, (int, float)):
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (claims, float(exp))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+token_cache = VerifiedTokenCache(TOKEN_CACHE_SIZE)
+
+
+def verify_token(token: str, secret_key: str, algorithm: str) -> dict:
+    """
+    ``jwt.decode`` without the cache, for single-use tokens such as refresh
+    tokens. Reports the time spent to ``token_cache.observe``.
+    """
+    started = time.perf_counter()
+    try:
+        return jwt.decode(token, secret_key, algorithms=[algorithm])
+    finally:
+        if token_cache.observe is not None:
+            token_cache.observe(time.perf_counter() - started)
+
+
+def decode_token(token: str, secret_key: str, algorithm: str) -> dict:
+    """
+    Return the claims of ``token``, verifying it only on a cache miss.
+    Raises JWTError exactly like ``jwt.decode`` for invalid tokens.
+    """
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = verify_token(token, secret_key, algorithm)
+        token_cache.put(token, claims)
+    return claims
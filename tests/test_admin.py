@@ -0,0 +1,33 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from service_common import admin
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "s3cret")
+    app = FastAPI()
+    app.state.pool_stats = lambda: {"primary": {"checked_out": 0}}
+    app.include_router(admin.router)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_admin_token_is_required(client):
+    assert client.get("/admin/db-pool").status_code == 403
+    assert client.get("/admin/db-pool", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.get("/admin/db-pool", headers={"X-Admin-Token": "s3cret"}).json() == {"primary": {"checked_out": 0}}
+
+
+def test_non_ascii_token_is_rejected_not_an_error(client):
+    response = client.get("/admin/db-pool", headers={"X-Admin-Token": "s3crét".encode("latin-1")})
+
+    assert response.status_code == 403
+
+
+def test_routes_are_hidden_without_a_configured_token(client, monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", None)
+
+    assert client.get("/admin/db-pool", headers={"X-Admin-Token": "s3cret"}).status_code == 404
@@ -0,0 +1,112 @@
+import threading
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, inspect
+from sqlalchemy.dialects import sqlite
+
+from service_common import schema_version
+from service_common.schema_version import (
+    SchemaOutOfDate,
+    ensure_schema,
+    metadata_checksum,
+    migrate,
+    stored_checksum,
+)
+
+metadata = MetaData()
+Table("notes", metadata, Column("id", Integer, primary_key=True), Column("body", String))
+CHECKSUM = metadata_checksum(metadata, sqlite.dialect())
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'schema.db'}"
+
+
+@pytest.fixture
+def engine(database_url):
+    engine = create_engine(database_url)
+    yield engine
+    engine.dispose()
+
+
+def counting_apply(calls: list):
+    def apply(conn):
+        calls.append(conn)
+        metadata.create_all(bind=conn)
+    return apply
+
+
+def test_checksum_tracks_the_ddl_and_the_revision():
+    changed = MetaData()
+    Table("notes", changed, Column("id", Integer, primary_key=True), Column("title", String))
+
+    assert metadata_checksum(metadata, sqlite.dialect()) == CHECKSUM
+    assert metadata_checksum(changed, sqlite.dialect()) != CHECKSUM
+    assert metadata_checksum(metadata, sqlite.dialect(), revision=1) != CHECKSUM
+
+
+def test_migrate_applies_once_and_records_the_checksum(engine):
+    calls = []
+
+    assert migrate(engine, "notes", CHECKSUM, counting_apply(calls)) is True
+    assert migrate(engine, "notes", CHECKSUM, counting_apply(calls)) is False
+
+    assert len(calls) == 1
+    assert stored_checksum(engine, "notes") == CHECKSUM
+    assert "notes" in inspect(engine).get_table_names()
+
+
+def test_force_reapplies(engine):
+    calls = []
+    migrate(engine, "notes", CHECKSUM, counting_apply(calls))
+
+    assert migrate(engine, "notes", CHECKSUM, counting_apply(calls), force=True) is True
+    assert len(calls) == 2
+
+
+def test_failed_apply_records_nothing(engine):
+    def apply(conn):
+        metadata.create_all(bind=conn)
+        raise RuntimeError("upgrade step failed")
+
+    with pytest.raises(RuntimeError):
+        migrate(engine, "notes", CHECKSUM, apply)
+
+    assert stored_checksum(engine, "notes") is None
+
+
+def test_ensure_schema_refuses_a_stale_schema_without_auto_migrate(engine, monkeypatch):
+    monkeypatch.setattr(schema_version, "SCHEMA_AUTO_MIGRATE", False)
+
+    with pytest.raises(SchemaOutOfDate):
+        ensure_schema(engine, "notes", CHECKSUM, counting_apply([]))
+
+
+def test_ensure_schema_passes_a_current_schema_without_auto_migrate(engine, monkeypatch):
+    migrate(engine, "notes", CHECKSUM, counting_apply([]))
+    monkeypatch.setattr(schema_version, "SCHEMA_AUTO_MIGRATE", False)
+
+    assert ensure_schema(engine, "notes", CHECKSUM, counting_apply([])) is False
+
+
+def test_concurrent_migrations_apply_once(database_url):
+    # One engine per thread stands in for replicas booting together
+    engines = [create_engine(database_url) for _ in range(4)]
+    calls, results = [], []
+    barrier = threading.Barrier(len(engines))
+
+    def boot(engine):
+        barrier.wait()
+        results.append(migrate(engine, "notes", CHECKSUM, counting_apply(calls)))
+
+    threads = [threading.Thread(target=boot, args=(engine,)) for engine in engines]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for engine in engines:
+        engine.dispose()
+
+    assert len(calls) == 1
+    assert sorted(results) == [False, False, False, True]